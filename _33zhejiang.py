@@ -1,48 +1,44 @@
-
-import requests
-from bs4 import BeautifulSoup
 import re
 from urllib.parse import urljoin
-from datetime import datetime, timedelta
 
-from dotenv import load_dotenv
-import os
-load_dotenv()
-CONTENT_LENGTH = int(os.getenv("CONTENT_LENGTH", 350))
-DAYS_AGO = int(os.getenv("DAYS_AGO", 7))
+from bs4 import SoupStrainer
+
+import dates
+import engine
+import html_parser
+import text_clean
 
-START_URLS = [
-    "http://lyj.zj.gov.cn/col/col1276365/index.html",
-    "http://lyj.zj.gov.cn/col/col1285504/index.html",
-]
+LIST_STRAINER = SoupStrainer("script", type="text/xml")  # 列表数据在 text/xml 脚本里，只解析这些标签
+URL_DATE = (dates.ART_DAY,)  # 详情页 URL 中的发布日期格式
+# 正文清洗规则，按顺序执行
+CLEANER = text_clean.Cleaner([
+    text_clean.blank_lines("\n\n"),
+    text_clean.whitespace(" ", strip=True),
+    text_clean.literal("新闻资讯 省内要闻 市县动态 国内外动态 省内要闻 首页 > 新闻资讯 > 省内要闻"),
+    text_clean.span("市县动态", "> 市县动态"),
+    text_clean.span("访问次数", "朋友圈"),
+])
 
-# === 工具函数 ===
-def make_request(url):
-    headers = {'User-Agent': 'Mozilla/5.0'}
-    r = requests.get(url, headers=headers, timeout=10)
-    if 'gb' in r.apparent_encoding.lower():
-        r.encoding = 'gbk'
-    else:
-        r.encoding = 'utf-8'
-    return r.text
 
-def parse_news_list_zhejiang(url):
-    """抓取单个新闻列表页并返回近一周新闻列表"""
-    html = make_request(url)
-    soup = BeautifulSoup(html, "html.parser")
+def parse_news_list_zhejiang(url, days_ago_date):
+    """抓取单个新闻列表页，返回 (近一周新闻条目, 是否有近一周新闻)"""
+    html = engine.request(SITE, url, conditional=True)
+    soup = html_parser.make_soup(html, SITE.code, parse_only=LIST_STRAINER)
     script_tag = soup.find('script', type='text/xml')
     if not script_tag:
         print(f"未找到新闻记录的 script 标签: {url}")
-        return []
+        return [], False
 
     script_content = script_tag.string
     records = re.findall(r'<record><!\[CDATA\[(.*?)\]\]></record>', script_content, re.DOTALL)
-    today = datetime.now()
-    days_ago_date = today - timedelta(days=DAYS_AGO)
 
     recent_news = []
     for record in records:
-        record_soup = BeautifulSoup(record, 'html.parser')
+        # 先按 URL 中的日期跳过过期条目，省去为每条记录建一次 soup
+        href_match = re.search(r'href="([^"]*)"', record)
+        if href_match and dates.url_is_stale(href_match.group(1), URL_DATE, days_ago_date):
+            continue
+        record_soup = html_parser.make_soup(record, SITE.code)
         link_tag = record_soup.find('a')
         date_td = record_soup.find('td', class_='hui14') or (
             record_soup.find_all('td')[2] if len(record_soup.find_all('td')) > 2 else None
@@ -53,63 +49,39 @@ def parse_news_list_zhejiang(url):
         href = urljoin(url, link_tag.get('href', ''))
         date_str = date_td.get_text().strip()
         try:
-            news_date = datetime.strptime(date_str, "%Y-%m-%d")
+            news_date = dates.parse_date(date_str)
             if news_date >= days_ago_date:
                 recent_news.append({
                     'url': href,
-                    'title': link_tag.get('title', ''),
+                    'title': link_tag.get('title', '').strip() or link_tag.get_text(strip=True),
                     'date': date_str
                 })
         except ValueError:
             continue
-    return recent_news
+    return recent_news, bool(recent_news)
 
-def parse_news_detail_zhejiang(url):
-    """抓取新闻详情文本"""
-    try:
-        html = make_request(url)
-        soup = BeautifulSoup(html, "html.parser")
-        content_div = None
-        for div in soup.find_all('div'):
-            text = div.get_text().strip()
-            if len(text) > 200 and len(text.split('\n')) > 3:
-                content_div = div
-                break
 
-        if content_div:
-            for element in content_div.find_all(['nav', 'header', 'footer', 'aside', 'script', 'style']):
-                element.decompose()
-            text = content_div.get_text(separator='\n', strip=True)
-            text = re.sub(r'\n\s*\n', '\n\n', text)
-            text = re.sub(r'\s+', ' ', text).strip()
-            text = re.sub(r'新闻资讯 省内要闻 市县动态 国内外动态 省内要闻 首页 > 新闻资讯 > 省内要闻', '', text, flags=re.DOTALL)
-            text = re.sub(r'市县动态.*?> 市县动态', '', text, flags=re.DOTALL)
-            text = re.sub(r'访问次数.*?朋友圈', '', text, flags=re.DOTALL)
-            if len(text) > CONTENT_LENGTH:
-                text = text[:CONTENT_LENGTH] + "..."
-            return '浙江省林草信息，' + text
-        else:
-            return ""
-    except Exception as e:
-        print(f"抓取新闻详情失败: 错误: {e}")
-        return ""
+SITE = engine.Site(
+    code="33",
+    name="浙江",
+    start_urls=[
+        "http://lyj.zj.gov.cn/col/col1276365/index.html",
+        "http://lyj.zj.gov.cn/col/col1285504/index.html",
+    ],
+    pages=None,  # 只抓第一页
+    list_rule=parse_news_list_zhejiang,
+    detail=engine.ContentRule(CLEANER),
+    display=engine.Display("浙江省林草信息，"),
+)
+
 
 def fetch_zhejiang_news():
     """抓取所有栏目近一周新闻，并返回文本数组"""
-    all_news_texts = []
-    print("33浙江数据采集开始")
-    for url in START_URLS:
-        news_list = parse_news_list_zhejiang(url)
-        for news in news_list:
-            text = parse_news_detail_zhejiang(news['url'])
-            if text:
-                all_news_texts.append(text)
-    print(f"33浙江     ", len(all_news_texts))
-    return all_news_texts
+    return engine.run(SITE)
+
 
 if __name__ == "__main__":
     zhejiang_news_list = fetch_zhejiang_news()
     print(f"\n抓取完成，总共获取 {len(zhejiang_news_list)} 条新闻")
     for i, text in enumerate(zhejiang_news_list, 1):
-        print(f"{i}、 {text}")
-
+        print(f"{i}、 {engine.display(SITE, text)}")
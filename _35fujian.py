@@ -1,61 +1,14 @@
-import re
-from bs4 import BeautifulSoup
-from urllib.parse import urljoin
-from datetime import datetime, timedelta
-import requests
+from bs4 import SoupStrainer
 
+import dates
+import engine
+import html_parser
 
-from dotenv import load_dotenv
-import os
-load_dotenv()
-CONTENT_LENGTH = int(os.getenv("CONTENT_LENGTH", 350))
-DAYS_AGO = int(os.getenv("DAYS_AGO", 7))
-START_URL = "https://lyj.fujian.gov.cn/zxzx/lydt/"
-
-# === 工具函数 ===
-def make_request(url):
-    headers = {'User-Agent': 'Mozilla/5.0'}
-    r = requests.get(url, headers=headers, timeout=10)
-    if 'gb' in r.apparent_encoding.lower():
-        r.encoding = 'gbk'
-    else:
-        r.encoding = 'utf-8'
-    return r.text
-
-def parse_news_list_fujian(url):
-    """抓取福建省新闻列表页并返回近一周新闻列表"""
-    html = make_request(url)
-    soup = BeautifulSoup(html, "html.parser")
-    news_list_items = soup.find_all("li")
-    today = datetime.now()
-    days_ago_date = today - timedelta(days=DAYS_AGO)
-    recent_news = []
-
-    for li in news_list_items:
-        a_tag = li.find("a")
-        if not a_tag:
-            continue
-        href = urljoin(url, a_tag.get("href"))
-        date_match = re.search(r'\d{4}-\d{2}-\d{2}', li.text)
-        if not date_match:
-            continue
-        date_str = date_match.group()
-        try:
-            news_date = datetime.strptime(date_str, "%Y-%m-%d")
-            if news_date >= days_ago_date:
-                recent_news.append({
-                    'url': href,
-                    'title': a_tag.get('title', ''),
-                    'date': date_str
-                })
-        except ValueError:
-            continue
-    return recent_news
 
 def parse_news_content_fujian(url):
     """抓取新闻详情文本"""
-    html = make_request(url)
-    soup = BeautifulSoup(html, "html.parser")
+    html = engine.request(SITE, url)
+    soup = html_parser.make_soup(html, SITE.code)
     title_tag = soup.find('meta', {'name': 'ArticleTitle'})
     title = title_tag['content'] if title_tag else '未找到标题'
     date_tag = soup.find('meta', {'name': 'PubDate'})
@@ -68,25 +21,32 @@ def parse_news_content_fujian(url):
     else:
         text_content = ""
 
-    text = f"{title}\n{date}\n{text_content}"
-    if len(text) > CONTENT_LENGTH:
-        text = text.replace('\n', '')
-        text = "福建省林草信息，" + text[:CONTENT_LENGTH] + "..."
-    return text
+    return f"{title}\n{date}\n{text_content}"
+
+
+SITE = engine.Site(
+    code="35",
+    name="福建",
+    start_urls=[
+        "https://lyj.fujian.gov.cn/zxzx/lydt/",
+    ],
+    pages=None,  # 只抓第一页
+    list_rule=engine.ListRule(
+        strainer=SoupStrainer("li"),  # 列表页只解析 <li>
+        url_date=(dates.TRS_DAY, dates.MONTH_DIR),  # 详情页 URL 中的发布日期格式
+    ),
+    detail=parse_news_content_fujian,
+    display=engine.Display("福建省林草信息，", only_truncated=True, flatten=True),
+)
+
 
 def fetch_fujian_news():
     """抓取福建省近一周新闻，并返回文本数组"""
-    all_news_texts = []
-    print("36福建数据采集开始")
-    news_list = parse_news_list_fujian(START_URL)
-    for idx, news in enumerate(news_list, 1):
-        text = parse_news_content_fujian(news['url'])
-        all_news_texts.append(text)
-    print(f"36福建     ", len(all_news_texts))
-    return all_news_texts
+    return engine.run(SITE)
+
 
 if __name__ == "__main__":
     fujian_news_texts = fetch_fujian_news()
     print(f"\n总共获取 {len(fujian_news_texts)} 条新闻")
     for i, text in enumerate(fujian_news_texts, 1):
-        print(f"{i}、 {text}")
+        print(f"{i}、 {engine.display(SITE, text)}")
@@ -1 +1 @@
-import reimport requestsfrom bs4 import BeautifulSoupfrom urllib.parse import urljoinfrom datetime import datetime, timedeltafrom dotenv import load_dotenvimport osload_dotenv()CONTENT_LENGTH = int(os.getenv("CONTENT_LENGTH", 350))DAYS_AGO = int(os.getenv("DAYS_AGO", 7))START_URLS = [    "https://lyj.guizhou.gov.cn/xwzx/sjdt/index.html",  # 林草快讯    "https://lyj.guizhou.gov.cn/xwzx/szdt/index.html",  # 工作动态]def make_request(url):    headers = {'User-Agent': 'Mozilla/5.0'}    r = requests.get(url, headers=headers, timeout=10)    if 'gb' in r.apparent_encoding.lower():        r.encoding = 'gbk'    else:        r.encoding = 'utf-8'    return r.textdef parse_news_list_guizhou(url, days_ago_date):    """解析新闻列表页"""    html = make_request(url)    soup = BeautifulSoup(html, 'html.parser')    news_list = []    has_recent_news = False    for li in soup.find_all("li"):        a_tag = li.find("a")        if not a_tag:            continue        href = urljoin(url, a_tag.get("href"))        date_match = re.search(r'\d{4}-\d{2}-\d{2}', li.text)        if not date_match:            continue        try:            news_date = datetime.strptime(date_match.group(), "%Y-%m-%d")            if news_date >= days_ago_date:                news_list.append({"url": href, "date": news_date})                has_recent_news = True        except ValueError:            continue    return news_list, has_recent_newsdef parse_news_detail_guizhou(url):    """解析新闻详情页"""    html = make_request(url)    soup = BeautifulSoup(html, 'html.parser')    # 标题    title_tag = soup.find('meta', {'name': 'ArticleTitle'})    title = title_tag['content'] if title_tag else '未找到标题'    # 日期    date_tag = soup.find('meta', {'name': 'PubDate'})    date = date_tag['content'][:10] if date_tag else ''    # 内容    content_div = soup.find('div', class_='trs_editor_view')    if content_div:        paragraphs = content_div.find_all('p')        text = ' '.join([p.get_text(strip=True) for p in paragraphs if p.get_text(strip=True)])    else:        text = ''    text = f'{title}\n{date}\n{text}'    text = re.sub(r'\s+', ' ', text)    if len(text) > CONTENT_LENGTH:        text = text[:CONTENT_LENGTH] + "..."    return textdef fetch_guizhou_news():    print("52贵州数据采集开始")    all_news = []    today = datetime.now()    days_ago_date = today - timedelta(days=DAYS_AGO)    for start_url in START_URLS:        page = 1        while True:            page_url = start_url if page == 1 else f"{start_url.rstrip('.html')}_{page}.html"            try:                news_list, has_recent_news = parse_news_list_guizhou(page_url, days_ago_date)            except Exception:                break            if not has_recent_news:                break            for news in news_list:                try:                    text = "贵州省林草信息" + parse_news_detail_guizhou(news["url"])                    all_news.append(text)                except Exception:                    continue            page += 1    print(f"52贵州     ", len(all_news))    return all_newsif __name__ == "__main__":    guizhou_news_list = fetch_guizhou_news()    for news in guizhou_news_list:        print("、、", news)
\ No newline at end of file
+from bs4 import SoupStrainerimport datesimport engineimport html_parserimport text_clean# 正文清洗规则，按顺序执行CLEANER = text_clean.Cleaner([    text_clean.whitespace(" "),])def parse_news_detail_guizhou(url):    """解析新闻详情页"""    html = engine.request(SITE, url)    soup = html_parser.make_soup(html, SITE.code)    # 标题    title_tag = soup.find('meta', {'name': 'ArticleTitle'})    title = title_tag['content'] if title_tag else '未找到标题'    # 日期    date_tag = soup.find('meta', {'name': 'PubDate'})    date = date_tag['content'][:10] if date_tag else ''    # 内容    content_div = soup.find('div', class_='trs_editor_view')    if content_div:        paragraphs = content_div.find_all('p')        text = ' '.join([p.get_text(strip=True) for p in paragraphs if p.get_text(strip=True)])    else:        text = ''    text = f'{title}\n{date}\n{text}'    text = CLEANER(text)    return textSITE = engine.Site(    code="52",    name="贵州",    start_urls=[        "https://lyj.guizhou.gov.cn/xwzx/sjdt/index.html",  # 林草快讯        "https://lyj.guizhou.gov.cn/xwzx/szdt/index.html",  # 工作动态    ],    pages=engine.template_pages("{url}", "{stem}_{n}.html"),    list_rule=engine.ListRule(        strainer=SoupStrainer("li"),  # 列表页只解析 <li>        url_date=(dates.TRS_DAY, dates.MONTH_DIR),  # 详情页 URL 中的发布日期格式    ),    detail=parse_news_detail_guizhou,    display=engine.Display("贵州省林草信息"),    skip_list_errors=True,)def fetch_guizhou_news():    return engine.run(SITE)if __name__ == "__main__":    for news in fetch_guizhou_news():        print("、、", engine.display(SITE, news))
\ No newline at end of file
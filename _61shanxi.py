@@ -2,56 +2,16 @@
 """
 陕西省林业和草原局近一周新闻爬虫（无彩色打印，无Word保存）
 """
-import re
-from datetime import datetime, timedelta
-from urllib.parse import urljoin
-import requests
-from bs4 import BeautifulSoup
+from bs4 import SoupStrainer
 
-from dotenv import load_dotenv
-import os
-load_dotenv()
-CONTENT_LENGTH = int(os.getenv("CONTENT_LENGTH", 350))
-DAYS_AGO = int(os.getenv("DAYS_AGO", 7))
-START_URLS = [
-    "https://lyj.shaanxi.gov.cn/zwxx/lydt/index",
-]
+import dates
+import engine
+import html_parser
 
-def make_request(url):
-    headers = {'User-Agent': 'Mozilla/5.0'}
-    r = requests.get(url, headers=headers, timeout=10)
-    if 'gb' in r.apparent_encoding.lower():
-        r.encoding = 'gbk'
-    else:
-        r.encoding = 'utf-8'
-    return r.text
-
-def parse_news_list_shanxi(url, days_ago_date):
-    html = make_request(url)
-    soup = BeautifulSoup(html, 'html.parser')
-    news_list = []
-    has_recent_news = False
-
-    for li in soup.find_all("li"):
-        a_tag = li.find("a")
-        if not a_tag:
-            continue
-        href = urljoin(url, a_tag.get("href"))
-        date_match = re.search(r'\d{4}-\d{2}-\d{2}', li.text)
-        if not date_match:
-            continue
-        try:
-            news_date = datetime.strptime(date_match.group(), "%Y-%m-%d")
-            if news_date >= days_ago_date:
-                news_list.append({"url": href, "date": news_date})
-                has_recent_news = True
-        except ValueError:
-            continue
-    return news_list, has_recent_news
 
 def parse_news_detail_shanxi(url):
-    html = make_request(url)
-    soup = BeautifulSoup(html, 'html.parser')
+    html = engine.request(SITE, url)
+    soup = html_parser.make_soup(html, SITE.code)
 
     # 提取标题
     title_div = soup.find('div', class_='con-tt')
@@ -73,36 +33,29 @@ def parse_news_detail_shanxi(url):
     else:
         text = ''
 
-    text = f"{title}\n{date}\n{text}"
-    if len(text) > CONTENT_LENGTH:
-        text = "陕西省林草信息，"+text[:CONTENT_LENGTH] + "..."
-        text = text.replace('\n', '')
-    return text
+    return f"{title}\n{date}\n{text}"
+
+
+SITE = engine.Site(
+    code="61",
+    name="陕西",
+    start_urls=[
+        "https://lyj.shaanxi.gov.cn/zwxx/lydt/index",
+    ],
+    pages=engine.template_pages("{url}.html", "{url}_{n}.html", offset=-1),
+    list_rule=engine.ListRule(
+        strainer=SoupStrainer("li"),  # 列表页只解析 <li>
+        url_date=(dates.TRS_DAY, dates.MONTH_DIR),  # 详情页 URL 中的发布日期格式
+    ),
+    detail=parse_news_detail_shanxi,
+    display=engine.Display("陕西省林草信息，", only_truncated=True, flatten=True),
+)
+
 
 def fetch_shanxi_news():
-    print("61陕西数据采集开始")
-    all_news = []
-    today = datetime.now()
-    days_ago_date = today - timedelta(days=DAYS_AGO)
+    return engine.run(SITE)
 
-    for start_url in START_URLS:
-        page = 1
-        while True:
-            page_url = f"{start_url}.html" if page == 1 else f"{start_url}_{page-1}.html"
-            news_list, has_recent_news = parse_news_list_shanxi(page_url, days_ago_date)
-            if not has_recent_news:
-                break
-            for news in news_list:
-                try:
-                    text = parse_news_detail_shanxi(news["url"])
-                    all_news.append(text)
-                except Exception:
-                    continue
-            page += 1
-    print(f"61陕西     ", len(all_news))
-    return all_news
 
 if __name__ == "__main__":
-    shanxi_news_list = fetch_shanxi_news()
-    for news in shanxi_news_list:
-        print("、、", news)
+    for news in fetch_shanxi_news():
+        print("、、", engine.display(SITE, news))
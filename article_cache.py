@@ -0,0 +1,101 @@
+"""
+文章缓存：以规范化后的详情页 URL 为键，把解析出的正文持久化到本地 SQLite，
+已发布的文章几乎不会再修改，再次抓取时直接复用，不再下载详情页
+"""
+import os
+import sqlite3
+import threading
+import time
+from urllib.parse import urlsplit, urlunsplit
+
+import config
+
+ENABLED = config.get("ARTICLE_CACHE", "1") != "0"
+CACHE_PATH = config.get("ARTICLE_CACHE_PATH", "cache/articles.sqlite3")
+TTL_DAYS = config.get_float("ARTICLE_CACHE_TTL_DAYS", 30)  # 超过此天数的缓存视为过期
+CONTENT_LENGTH = config.CONTENT_LENGTH
+
+_DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+def canonical_url(url):
+    """规范化 URL：协议与主机小写，去掉默认端口和锚点"""
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    if parts.port and parts.port != _DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{parts.port}"
+    return urlunsplit((scheme, host, parts.path or "/", parts.query, ""))
+
+
+def parser_key(func, snippet=False):
+    """缓存按解析函数区分；截断模式下缓存的只是够截取 CONTENT_LENGTH 的正文开头，
+    与完整正文分开保存"""
+    key = f"{func.__module__}.{func.__name__}"
+    return f"{key}:snippet:{CONTENT_LENGTH}" if snippet else key
+
+
+class ArticleCache:
+    def __init__(self, path=CACHE_PATH, ttl_days=TTL_DAYS):
+        self.path = path
+        self.ttl = ttl_days * 86400
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self._lock = threading.Lock()
+        self._conn = None
+
+    def _connect(self):
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS articles ("
+                " url TEXT NOT NULL, parser TEXT NOT NULL, text TEXT NOT NULL,"
+                " title TEXT, date TEXT, fetched_at REAL NOT NULL,"
+                " PRIMARY KEY (url, parser))"
+            )
+            conn.execute("DELETE FROM articles WHERE fetched_at < ?", (time.time() - self.ttl,))
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def get(self, url, parser):
+        with self._lock:
+            row = self._connect().execute(
+                "SELECT text FROM articles WHERE url = ? AND parser = ? AND fetched_at >= ?",
+                (canonical_url(url), parser, time.time() - self.ttl),
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return row[0]
+
+    def put(self, url, parser, text, title=None, date=None):
+        with self._lock:
+            conn = self._connect()
+            conn.execute(
+                "INSERT OR REPLACE INTO articles (url, parser, text, title, date, fetched_at)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (canonical_url(url), parser, text, title, date, time.time()),
+            )
+            conn.commit()
+            self.stores += 1
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "enabled": ENABLED,
+                "hits": self.hits,
+                "misses": self.misses,
+                "stores": self.stores,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            }
+
+
+cache = ArticleCache()
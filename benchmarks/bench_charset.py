@@ -0,0 +1,69 @@
+"""
+编码判断基准：在录制的页面上比较 response.apparent_encoding（对整页运行 chardet）
+与 charset_resolver 的耗时，并检查两者按原有规则得出的编码（gbk / utf-8）一致
+
+用法：python benchmarks/bench_charset.py pages/
+pages/ 为 bench_parsers.py --record 录制的目录；每个页面分别按 UTF-8、带 meta 的 GBK、不带 meta 的 GBK 编码后测试
+"""
+import os
+import sys
+import time
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import charset_resolver  # noqa: E402
+from bench_parsers import load_pages  # noqa: E402
+
+VARIANTS = ("utf-8", "gbk+meta", "gbk")
+
+
+def make_response(html, variant, host):
+    if variant == "utf-8":
+        content = html.encode("utf-8")
+    else:
+        if variant == "gbk+meta":
+            html = '<meta http-equiv="Content-Type" content="text/html; charset=gb2312">' + html
+        content = html.encode("gbk", "ignore")
+    resp = requests.Response()
+    resp._content = content
+    resp.url = f"https://{host}/page.html"
+    resp.headers = CaseInsensitiveDict({"Content-Type": "text/html"})
+    return resp
+
+
+def apparent(resp):
+    return "gbk" if "gb" in (resp.apparent_encoding or "").lower() else "utf-8"
+
+
+def main():
+    if len(sys.argv) != 2:
+        print(__doc__)
+        sys.exit(1)
+
+    pages = load_pages(sys.argv[1])
+    print(f"{'编码':<10}{'页面数':>8}{'apparent(ms)':>16}{'resolver(ms)':>16}{'加速':>8}  一致")
+    mismatches = 0
+    for variant in VARIANTS:
+        responses = [make_response(html, variant, f"{variant}-{code}.example")
+                     for code, htmls in pages.items() for html in htmls]
+        start = time.perf_counter()
+        expected = [apparent(resp) for resp in responses]
+        apparent_ms = (time.perf_counter() - start) * 1000
+        start = time.perf_counter()
+        actual = [charset_resolver.resolve(resp) for resp in responses]
+        resolver_ms = (time.perf_counter() - start) * 1000
+        same = sum(a == b for a, b in zip(expected, actual))
+        mismatches += len(responses) - same
+        print(f"{variant:<10}{len(responses):>8}{apparent_ms:>16.1f}{resolver_ms:>16.1f}"
+              f"{apparent_ms / resolver_ms:>7.0f}x  {same}/{len(responses)}")
+
+    print("\n各主机的判断来源：")
+    for host, stats in charset_resolver.charset_stats().items():
+        print(f"  {host:<24}{stats['avg_ms']:>8.3f} ms/页  {stats['sources']}")
+    sys.exit(1 if mismatches else 0)
+
+
+if __name__ == "__main__":
+    main()
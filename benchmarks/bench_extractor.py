@@ -0,0 +1,81 @@
+"""
+正文定位基准：对比原来逐个 div 调用 get_text() 的写法与 extractor.find_content_div 的耗时，
+并检查两者选出的是否为同一个 div
+
+用法：python benchmarks/bench_extractor.py [保存的详情页 .html 文件或目录 ...]
+不传参数时使用生成的多层嵌套页面
+"""
+import os
+import sys
+import time
+
+from bs4 import BeautifulSoup
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import extractor  # noqa: E402
+
+REPEAT = 5
+
+
+def find_content_div_scan(soup):
+    """各省原来的写法"""
+    for div in soup.find_all('div'):
+        text = div.get_text().strip()
+        if len(text) > 200 and len(text.split('\n')) > 3:
+            return div
+    return None
+
+
+def synthetic_page(depth, paragraphs, minified=False):
+    """生成正文藏在多层 div 里的页面，外层穿插导航等短文字；minified 时整页没有换行，没有 div 满足条件"""
+    newline = "" if minified else "\n"
+    body = "".join(f"<div class=\"para\"><p>第{i}段 林草资讯正文内容，" + "森林草原保护" * 8 + f"</p></div>{newline}"
+                   for i in range(paragraphs))
+    for level in range(depth):
+        body = f'<div class="wrap{level}"><div class="nav">首页 &gt; 栏目{level}</div>{body}</div>'
+    return f"<html><head><title>测试</title></head><body>{body}</body></html>"
+
+
+def load_pages(paths):
+    pages = []
+    for path in paths:
+        if os.path.isdir(path):
+            pages += load_pages(sorted(os.path.join(path, name) for name in os.listdir(path) if name.endswith(".html")))
+        else:
+            with open(path, encoding="utf-8", errors="replace") as f:
+                pages.append((os.path.basename(path), f.read()))
+    return pages
+
+
+def timed(func, soup):
+    start = time.perf_counter()
+    for _ in range(REPEAT):
+        result = func(soup)
+    return (time.perf_counter() - start) / REPEAT * 1000, result
+
+
+def main():
+    if len(sys.argv) > 1:
+        pages = load_pages(sys.argv[1:])
+    else:
+        pages = [(f"{'min' if minified else 'page'}_d{depth}_p{paragraphs}", synthetic_page(depth, paragraphs, minified))
+                 for minified in (False, True) for depth in (5, 20, 60) for paragraphs in (10, 100)]
+
+    print(f"{'页面':<24}{'原写法(ms)':>12}{'单遍(ms)':>12}{'加速':>8}  结果一致")
+    total_scan = total_single = 0.0
+    mismatches = 0
+    for name, html in pages:
+        soup = BeautifulSoup(html, "html.parser")
+        scan_ms, expected = timed(find_content_div_scan, soup)
+        single_ms, actual = timed(extractor.find_content_div, soup)
+        same = expected is actual
+        mismatches += not same
+        total_scan += scan_ms
+        total_single += single_ms
+        print(f"{name:<24}{scan_ms:>12.2f}{single_ms:>12.2f}{scan_ms / single_ms:>7.1f}x  {'✅' if same else '❌'}")
+    print(f"{'合计':<24}{total_scan:>12.2f}{total_single:>12.2f}{total_scan / total_single:>7.1f}x  不一致 {mismatches} 个")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,96 @@
+"""
+启动基准：在新的解释器里以 -X importtime 导入 main，统计冷启动耗时、导入的模块数与进程内存（RSS），
+并列出累计耗时最多的模块；随后导入全部省份模块，对比首次抓取前后各自的开销
+
+用法：python benchmarks/bench_import.py [模块名，默认 main] [--top N]
+每次在新进程中运行，共 REPEAT 次，耗时取中位数
+"""
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+REPEAT = 5
+TOP = 15
+MARKER = "--- load provinces"
+HEAVY = ("fastapi", "uvicorn", "requests", "bs4", "lxml", "sqlite3")  # 关注是否在启动时加载的包
+
+CHILD = """
+import json, resource, sys, time
+start = time.perf_counter()
+import {module}
+result = {{
+    "import_ms": (time.perf_counter() - start) * 1000,
+    "rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    "modules": len(sys.modules),
+    "heavy": [name for name in {heavy!r} if name in sys.modules],
+}}
+sys.stderr.write("{marker}\\n")
+import sites
+start = time.perf_counter()
+for province in sites.PROVINCES:
+    sites.load(province.code)
+result["load_all_ms"] = (time.perf_counter() - start) * 1000
+result["load_all_rss_mb"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+result["load_all_modules"] = len(sys.modules)
+print(json.dumps(result))
+"""
+
+
+def run_once(module):
+    """在新进程中导入一次，返回 (统计结果, -X importtime 的输出)"""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", CHILD.format(module=module, heavy=HEAVY, marker=MARKER)],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+    return json.loads(proc.stdout.strip().splitlines()[-1]), proc.stderr
+
+
+def parse_importtime(output):
+    """解析启动阶段的 -X importtime 输出，返回 [(模块名, 自身耗时 us, 累计耗时 us)]"""
+    rows = []
+    for line in output.split(MARKER)[0].splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        rows.append((name.strip(), int(self_us), int(cumulative_us)))
+    return rows
+
+
+def main():
+    args = sys.argv[1:]
+    top = TOP
+    if "--top" in args:
+        index = args.index("--top")
+        top = int(args[index + 1])
+        del args[index:index + 2]
+    module = args[0] if args else "main"
+
+    runs = []
+    timings = {}
+    for _ in range(REPEAT):
+        result, output = run_once(module)
+        runs.append(result)
+        for name, _self_us, cumulative_us in parse_importtime(output):
+            timings.setdefault(name, []).append(cumulative_us)
+
+    first = runs[0]
+    import_ms = statistics.median(r["import_ms"] for r in runs)
+    load_all_ms = statistics.median(r["load_all_ms"] for r in runs)
+    print(f"冷启动（import {module}）：{import_ms:.1f} ms，{first['modules']} 个模块，"
+          f"RSS {statistics.median(r['rss_mb'] for r in runs):.1f} MB")
+    print(f"  启动时已加载：{', '.join(first['heavy']) or '无'}")
+    print(f"导入全部省份：+{load_all_ms:.1f} ms，{first['load_all_modules']} 个模块，"
+          f"RSS {statistics.median(r['load_all_rss_mb'] for r in runs):.1f} MB")
+
+    print(f"\n启动阶段累计耗时最多的模块（中位数，共 {REPEAT} 次）：")
+    print(f"{'模块':<40}{'累计(ms)':>10}")
+    ranked = sorted(timings.items(), key=lambda item: statistics.median(item[1]), reverse=True)
+    for name, values in ranked[:top]:
+        print(f"{name:<40}{statistics.median(values) / 1000:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+列表页解析基准：比较完整解析与按 LIST_STRAINER 只解析所需子树的耗时、峰值内存，
+并检查两种方式下列表解析函数提取的条目完全一致
+
+用法：python benchmarks/bench_list_strainer.py pages/
+pages/ 为 bench_parsers.py --record 录制的目录（pages/<省份代码>/*.html）
+"""
+import contextlib
+import io
+import os
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import engine  # noqa: E402
+import html_parser  # noqa: E402
+import sites  # noqa: E402
+from bench_parsers import load_pages  # noqa: E402
+
+REPEAT = 3
+BASE_URL = "https://example.gov.cn/list/index.html"
+
+
+def list_strainer(site):
+    """站点列表页使用的 strainer；自定义列表解析函数的站点取其模块中的 LIST_STRAINER"""
+    if isinstance(site.list_rule, engine.ListRule):
+        return site.list_rule.strainer
+    return getattr(sys.modules[site.list_rule.__module__], "LIST_STRAINER", None)
+
+
+def parse_items(site, html, strainer):
+    """用给定的 strainer 运行站点的列表解析，返回提取的条目"""
+    days_ago_date = datetime.now() - timedelta(days=36500)
+    original = engine.request
+    engine.request = lambda site, url, conditional=False: html
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            if isinstance(site.list_rule, engine.ListRule):
+                rule = site.list_rule._replace(strainer=strainer)
+                return engine.parse_list(site._replace(list_rule=rule), BASE_URL, days_ago_date)
+            module = sys.modules[site.list_rule.__module__]
+            original_strainer, module.LIST_STRAINER = module.LIST_STRAINER, strainer
+            try:
+                return site.list_rule(BASE_URL, days_ago_date)
+            finally:
+                module.LIST_STRAINER = original_strainer
+    except Exception as e:
+        return f"异常：{e}"
+    finally:
+        engine.request = original
+
+
+def measure(htmls, code, strainer):
+    start = time.perf_counter()
+    for _ in range(REPEAT):
+        for html in htmls:
+            html_parser.make_soup(html, code, parse_only=strainer)
+    elapsed = (time.perf_counter() - start) / REPEAT * 1000
+
+    peak = 0
+    for html in htmls:
+        tracemalloc.start()
+        soup = html_parser.make_soup(html, code, parse_only=strainer)
+        peak = max(peak, tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+        del soup
+    return elapsed, peak / 1024
+
+
+def main():
+    if len(sys.argv) != 2:
+        print(__doc__)
+        sys.exit(1)
+
+    print(f"{'省份':<6}{'页面数':>6}{'完整(ms)':>12}{'裁剪(ms)':>12}{'完整(KB)':>12}{'裁剪(KB)':>12}  条目一致")
+    mismatches = 0
+    for code, htmls in load_pages(sys.argv[1]).items():
+        site = sites.load(code) if code in sites.BY_CODE else None
+        strainer = list_strainer(site) if site else None
+        if strainer is None:
+            continue
+        full_ms, full_kb = measure(htmls, code, None)
+        strained_ms, strained_kb = measure(htmls, code, strainer)
+        same = all(parse_items(site, html, None) == parse_items(site, html, strainer) for html in htmls)
+        mismatches += not same
+        print(f"{code:<6}{len(htmls):>6}{full_ms:>12.1f}{strained_ms:>12.1f}{full_kb:>12.0f}{strained_kb:>12.0f}"
+              f"  {'✅' if same else '❌'}")
+    sys.exit(1 if mismatches else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+"""
+解析器基准：在录制的页面上比较各解析后端每个省份的解析耗时与峰值内存
+
+录制：python benchmarks/bench_parsers.py --record pages/
+      实际跑一遍各省爬虫，把每个请求到的页面按省份代码保存到 pages/<代码>/
+对比：python benchmarks/bench_parsers.py pages/
+未安装的后端自动跳过；selectolax 不能替代 BeautifulSoup 的接口，只作为纯解析耗时的参照
+"""
+import os
+import sys
+import threading
+import time
+import tracemalloc
+
+from bs4 import BeautifulSoup, FeatureNotFound
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import html_parser  # noqa: E402
+
+REPEAT = 3
+RECORD_LIMIT = 20  # 每个省份最多保存的页面数
+
+
+def record(directory):
+    """运行各省爬虫，把请求到的页面保存下来"""
+    import sites
+    import transport
+
+    get_text = transport.get_text
+    saved = {}
+    lock = threading.Lock()
+
+    def recording_get_text(url, *args, **kwargs):
+        text = get_text(url, *args, **kwargs)
+        code = current[0]
+        with lock:
+            if saved.get(code, 0) >= RECORD_LIMIT:
+                return text
+            saved[code] = number = saved.get(code, 0) + 1
+        os.makedirs(os.path.join(directory, code), exist_ok=True)
+        with open(os.path.join(directory, code, f"{number:03d}.html"), "w", encoding="utf-8") as f:
+            f.write(text)
+        return text
+
+    transport.get_text = recording_get_text
+    current = [None]
+    for province in sites.PROVINCES:
+        current[0] = province.code
+        try:
+            sites.run(province.code)
+        except Exception as e:
+            print(f"⚠️ {province.code}{province.name} 录制失败：{e}")
+        print(f"{province.code}{province.name} 保存 {saved.get(province.code, 0)} 个页面")
+
+
+def load_pages(directory):
+    pages = {}
+    for code in sorted(os.listdir(directory)):
+        site_dir = os.path.join(directory, code)
+        if not os.path.isdir(site_dir):
+            continue
+        pages[code] = []
+        for name in sorted(os.listdir(site_dir)):
+            with open(os.path.join(site_dir, name), encoding="utf-8") as f:
+                pages[code].append(f.read())
+    return pages
+
+
+def _soup_parse(backend):
+    def parse(html):
+        return BeautifulSoup(html, backend)
+    return parse
+
+
+def _selectolax_parse():
+    try:
+        from selectolax.parser import HTMLParser
+    except ImportError:
+        return None
+    return HTMLParser
+
+
+def available_backends():
+    backends = {}
+    for backend in html_parser.BACKENDS:
+        try:
+            BeautifulSoup("<p></p>", backend)
+        except FeatureNotFound:
+            continue
+        backends[backend] = _soup_parse(backend)
+    selectolax = _selectolax_parse()
+    if selectolax:
+        backends["selectolax(参照)"] = selectolax
+    return backends
+
+
+def measure(parse, htmls):
+    """返回解析全部页面的平均耗时（毫秒）与单个页面的最大峰值内存（KB）"""
+    start = time.perf_counter()
+    for _ in range(REPEAT):
+        for html in htmls:
+            parse(html)
+    elapsed = (time.perf_counter() - start) / REPEAT * 1000
+
+    peak = 0
+    for html in htmls:
+        tracemalloc.start()
+        tree = parse(html)
+        peak = max(peak, tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+        del tree
+    return elapsed, peak / 1024
+
+
+def main():
+    if len(sys.argv) == 3 and sys.argv[1] == "--record":
+        record(sys.argv[2])
+        return
+    if len(sys.argv) != 2:
+        print(__doc__)
+        sys.exit(1)
+
+    pages = load_pages(sys.argv[1])
+    backends = available_backends()
+    print(f"{'省份':<6}{'页面数':>6}  " + "".join(f"{name:>26}" for name in backends))
+    print(f"{'':<14}" + "".join(f"{'耗时(ms) / 峰值(KB)':>26}" for _ in backends))
+    totals = {name: 0.0 for name in backends}
+    for code, htmls in pages.items():
+        cells = []
+        for name, parse in backends.items():
+            elapsed, peak = measure(parse, htmls)
+            totals[name] += elapsed
+            cells.append(f"{elapsed:>14.1f} / {peak:>9.0f}")
+        print(f"{code:<6}{len(htmls):>6}  " + "".join(cells))
+    print(f"{'合计':<12}  " + "".join(f"{totals[name]:>14.1f}{'':>12}" for name in backends))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+正文清洗基准：对每个省份的 CLEANER，比较原来逐条 re.sub 的写法与编译后的清洗流程的耗时，
+检查两者输出一致；并用只有起始词、没有结束词的构造输入检查清洗耗时随长度线性增长
+
+用法：python benchmarks/bench_text_clean.py
+"""
+import contextlib
+import importlib
+import io
+import os
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+REPEAT = 20
+ADVERSARIAL_SIZES = (2000, 8000)  # 构造输入中起始词的重复次数
+MAX_GROWTH = 8                    # 输入变为 4 倍时耗时最多允许增长的倍数（平方级约为 16）
+
+
+def regex_chain(rules):
+    """把清洗规则还原为原来的 re.sub 写法，作为对照"""
+    steps = []
+    for rule in rules:
+        if rule.kind == "blank_lines":
+            steps.append(lambda text, repl=rule.args[0]: re.sub(r'\n\s*\n', repl, text))
+        elif rule.kind == "whitespace":
+            repl, strip = rule.args
+            steps.append(lambda text, repl=repl, strip=strip: (
+                re.sub(r'\s+', repl, text).strip() if strip else re.sub(r'\s+', repl, text)))
+        elif rule.kind == "literal":
+            old, new = rule.args
+            steps.append(lambda text, old=old, new=new: re.sub(re.escape(old), new, text, flags=re.DOTALL))
+        elif rule.kind == "span":
+            start, end, repl, keep_end, dotall = rule.args
+            pattern = re.escape(start) + ".*?" + (f"(?={re.escape(end)})" if keep_end else re.escape(end))
+            steps.append(lambda text, pattern=pattern, repl=repl, flags=re.DOTALL if dotall else 0:
+                         re.sub(pattern, repl, text, flags=flags))
+
+    def run(text):
+        for step in steps:
+            text = step(text)
+        return text
+    return run
+
+
+def sample_text(rules):
+    """拼出带有各条规则起止词的正文"""
+    paragraph = "森林草原防火工作会议在省林草局召开，会议部署了下一阶段重点工作。\n \n"
+    markers = []
+    for rule in rules:
+        if rule.kind == "span":
+            markers.append(f"{rule.args[0]} 栏目 导航 {rule.args[1]}")
+        elif rule.kind == "literal":
+            markers.append(rule.args[0])
+    return "\n".join(markers) + "\n" + paragraph * 200 + "\n".join(reversed(markers))
+
+
+def adversarial_text(rules, size):
+    """只有起始词、没有结束词：逐条 re.sub 的懒惰匹配对每个起始词都要扫描到文本末尾"""
+    starts = [rule.args[0] for rule in rules if rule.kind == "span"]
+    return "".join(f"{start} x " for start in starts) * size
+
+
+def timed(func, text, repeat=REPEAT):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = func(text)
+    return (time.perf_counter() - start) / repeat * 1000, result
+
+
+def site_cleaners():
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    for name in sorted(os.listdir(root)):
+        if name.startswith("_") and name[1:3].isdigit() and name.endswith(".py"):
+            with contextlib.redirect_stdout(io.StringIO()):
+                module = importlib.import_module(name[:-3])
+            cleaner = getattr(module, "CLEANER", None)
+            if cleaner is not None:
+                yield name[1:3], cleaner
+
+
+def main():
+    failures = 0
+    print(f"{'省份':<6}{'re.sub(ms)':>12}{'清洗流程(ms)':>14}{'一致':>6}{'构造输入 re.sub(ms)':>22}{'清洗流程(ms)':>14}{'增长':>8}")
+    for code, cleaner in site_cleaners():
+        reference = regex_chain(cleaner.rules)
+        text = sample_text(cleaner.rules)
+        old_ms, expected = timed(reference, text)
+        new_ms, actual = timed(cleaner, text)
+        same = expected == actual
+
+        adversarial = [adversarial_text(cleaner.rules, size) for size in ADVERSARIAL_SIZES]
+        if adversarial[0]:
+            old_adv_ms, expected_adv = timed(reference, adversarial[0], repeat=1)
+            small_ms, actual_adv = timed(cleaner, adversarial[0], repeat=3)
+            large_ms, _ = timed(cleaner, adversarial[1], repeat=3)
+            same = same and expected_adv == actual_adv
+            growth = large_ms / small_ms if small_ms else 0.0
+            linear = growth < MAX_GROWTH
+            adv_cells = f"{old_adv_ms:>22.1f}{small_ms:>14.2f}{growth:>7.1f}x"
+        else:
+            linear = True
+            adv_cells = f"{'-':>22}{'-':>14}{'-':>8}"
+
+        failures += not same or not linear
+        print(f"{code:<6}{old_ms:>12.3f}{new_ms:>14.3f}{'✅' if same else '❌':>6}{adv_cells}{'' if linear else ' ❌'}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""
+页面编码判断：依次查看 Content-Type、BOM、前几 KB 里的 <meta charset>、UTF-8 校验与主机上次的结果，
+都无法确定时才对一段有限长度的内容做统计探测，避免 apparent_encoding 对整页运行 chardet；
+判断结果仍按原有规则归为 gbk 或 utf-8
+"""
+import codecs
+import re
+import threading
+import time
+from urllib.parse import urlsplit
+
+from requests.compat import chardet
+
+import config
+
+META_SCAN_BYTES = config.get_int("CHARSET_META_BYTES", 4096)   # 在前多少字节内查找 <meta charset>
+DETECT_BYTES = config.get_int("CHARSET_DETECT_BYTES", 16384)     # 统计探测最多检查的字节数
+
+_CHARSET_PARAM = re.compile(r"charset\s*=\s*[\"']?([\w.:-]+)", re.I)
+_META_CHARSET = re.compile(rb"<meta[^>]+charset\s*=\s*[\"']?([\w.:-]+)", re.I)
+_NON_ASCII = re.compile(rb"[\x80-\xff]")
+_BOMS = (
+    (codecs.BOM_UTF8, "utf-8"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+)
+
+_lock = threading.Lock()
+_host_charsets = {}
+_host_stats = {}
+
+
+def _normalize(name):
+    """沿用各站点原有规则：名称里带 gb 的按 gbk 解码，其余按 utf-8"""
+    return "gbk" if "gb" in name.lower() else "utf-8"
+
+
+def _header_charset(content_type):
+    match = _CHARSET_PARAM.search(content_type or "")
+    return match.group(1) if match else None
+
+
+def _bom_charset(content):
+    for bom, name in _BOMS:
+        if content.startswith(bom):
+            return name
+    return None
+
+
+def _meta_charset(content):
+    match = _META_CHARSET.search(content[:META_SCAN_BYTES])
+    return match.group(1).decode("ascii", "ignore") if match else None
+
+
+def _is_utf8(content, partial=False):
+    """partial 为真时 content 只是响应开头的一段，末尾被截断的字符不算错误"""
+    try:
+        codecs.getincrementaldecoder("utf-8")().decode(content, final=not partial)
+    except UnicodeDecodeError:
+        return False
+    return True
+
+
+def _declaration_fits(encoding, content, partial=False):
+    """声明的编码是否与内容相符：含非 ASCII 字节的合法 UTF-8 内容只会是 utf-8，反之亦然"""
+    if not _NON_ASCII.search(content):
+        return True
+    return (encoding == "utf-8") == _is_utf8(content, partial)
+
+
+def _detect(content):
+    """从第一个非 ASCII 字节开始，对至多 DETECT_BYTES 字节做统计探测"""
+    if chardet is None:
+        return "utf-8"
+    match = _NON_ASCII.search(content)
+    start = match.start() if match else 0
+    return chardet.detect(content[start:start + DETECT_BYTES])["encoding"] or "utf-8"
+
+
+def _resolve(content, content_type, host, partial):
+    for source, name in (
+        ("header", _header_charset(content_type)),
+        ("bom", _bom_charset(content)),
+        ("meta", _meta_charset(content)),
+    ):
+        if name:
+            encoding = _normalize(name)
+            if _declaration_fits(encoding, content, partial):
+                return source, encoding
+            # 声明与内容不符时忽略声明，继续往下判断
+            break
+    if _is_utf8(content, partial):
+        return "utf8", "utf-8"
+    with _lock:
+        cached = _host_charsets.get(host)
+    if cached:
+        return "cached", cached
+    return "detected", _normalize(_detect(content))
+
+
+def resolve(resp):
+    """返回响应应使用的编码（gbk 或 utf-8），并记录主机的判断来源与耗时"""
+    return resolve_bytes(resp.content, resp.headers.get("Content-Type"), resp.url)
+
+
+def resolve_bytes(content, content_type, url, partial=False):
+    """同 resolve；content 可以只是响应开头的一段（partial 为真）"""
+    host = urlsplit(url).hostname or ""
+    start = time.perf_counter()
+    source, encoding = _resolve(content, content_type, host, partial)
+    elapsed = time.perf_counter() - start
+    with _lock:
+        if source != "utf8":
+            _host_charsets[host] = encoding
+        stats = _host_stats.setdefault(host, {"pages": 0, "seconds": 0.0, "sources": {}})
+        stats["pages"] += 1
+        stats["seconds"] += elapsed
+        stats["sources"][source] = stats["sources"].get(source, 0) + 1
+    return encoding
+
+
+def charset_stats():
+    """返回每个主机的页面数、判断耗时与各判断来源的次数"""
+    with _lock:
+        return {
+            host: {
+                "pages": stats["pages"],
+                "avg_ms": round(stats["seconds"] / stats["pages"] * 1000, 3),
+                "total_ms": round(stats["seconds"] * 1000, 1),
+                "charset": _host_charsets.get(host),
+                "sources": dict(stats["sources"]),
+            }
+            for host, stats in _host_stats.items()
+        }
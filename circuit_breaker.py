@@ -0,0 +1,89 @@
+"""
+按主机的熔断器：连续失败达到阈值后熔断（open），冷却期内的请求直接失败；
+冷却结束后只放行一个探测请求（half_open），成功则恢复（closed），失败则重新熔断
+"""
+import threading
+import time
+
+import requests
+
+import config
+
+FAILURE_THRESHOLD = config.get_int("BREAKER_FAILURES", 5)  # 连续失败多少次后熔断
+COOLDOWN = config.get_float("BREAKER_COOLDOWN", 60)        # 熔断后多久放行探测请求（秒）
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(requests.ConnectionError):
+    """主机处于熔断状态，请求未发出"""
+
+
+class CircuitBreaker:
+    def __init__(self, host, threshold=FAILURE_THRESHOLD, cooldown=COOLDOWN):
+        self.host = host
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.rejected = 0
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def before_request(self):
+        """请求前调用；熔断中或已有探测请求在途时抛出 CircuitOpenError"""
+        with self._lock:
+            if self.state == OPEN and time.monotonic() - self.opened_at >= self.cooldown:
+                self.state = HALF_OPEN
+                self._probing = False
+            if self.state == CLOSED:
+                return
+            if self.state == HALF_OPEN and not self._probing:
+                self._probing = True
+                return
+            self.rejected += 1
+        raise CircuitOpenError(f"{self.host} 已熔断，跳过请求")
+
+    def record_success(self):
+        with self._lock:
+            self.state = CLOSED
+            self.failures = 0
+            self._probing = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == HALF_OPEN or self.failures >= self.threshold:
+                self.state = OPEN
+                self.opened_at = time.monotonic()
+            self._probing = False
+
+    def snapshot(self):
+        with self._lock:
+            return {"state": self.state, "failures": self.failures, "rejected": self.rejected}
+
+
+_breakers_lock = threading.Lock()
+_breakers = {}
+
+
+def breaker_for(host):
+    with _breakers_lock:
+        breaker = _breakers.get(host)
+        if breaker is None:
+            breaker = _breakers[host] = CircuitBreaker(host)
+    return breaker
+
+
+def breaker_states(hosts=None):
+    """返回各主机熔断器的状态；未请求过的主机视为 closed"""
+    with _breakers_lock:
+        hosts = list(_breakers) if hosts is None else hosts
+        breakers = {host: _breakers.get(host) for host in hosts}
+    return {
+        host: breaker.snapshot() if breaker else {"state": CLOSED, "failures": 0, "rejected": 0}
+        for host, breaker in breakers.items()
+    }
@@ -0,0 +1,25 @@
+"""
+配置：进程内只读取一次 .env，各模块通过这里取环境变量
+"""
+import os
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+
+def get(key, default):
+    return os.getenv(key, default)
+
+
+def get_int(key, default):
+    return int(os.getenv(key, default))
+
+
+def get_float(key, default):
+    return float(os.getenv(key, default))
+
+
+# === 多个模块共用的配置 ===
+CONTENT_LENGTH = get_int("CONTENT_LENGTH", 350)  # 摘要截取的字符数
+DAYS_AGO = get_int("DAYS_AGO", 7)                # 只抓取最近多少天的新闻
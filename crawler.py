@@ -0,0 +1,165 @@
+"""
+栏目抓取：列表页在调用线程中逐页请求，解析出的详情链接立即进入所在主机的有界线程池下载，
+同一主机的并发数可按站点配置，结果按提交顺序（即列表页顺序）取回
+"""
+import contextvars
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+import article_cache
+import config
+import dates
+import text_clean
+import transport
+import watermarks
+
+DETAIL_CONCURRENCY = config.get_int("DETAIL_CONCURRENCY", 4)  # 每个主机默认的详情页并发数，1 即逐条抓取
+CONTENT_LENGTH = config.CONTENT_LENGTH
+SNIPPET_MODE = config.get("SNIPPET_MODE", "0") == "1"          # 详情页只读取足够截取摘要的开头部分
+SNIPPET_MARGIN = config.get_int("SNIPPET_MARGIN", 200)         # 判断摘要不再变化时多比较的字符数
+KNOWN_RUN = 2  # 增量模式下连续遇到多少条已见过的新闻才停止翻页，单条可能只是置顶
+
+
+def _parse_host_limits(value):
+    """解析 "host=n,host=n" 形式的配置"""
+    limits = {}
+    for item in value.split(","):
+        if "=" not in item:
+            continue
+        host, limit = item.split("=", 1)
+        limits[host.strip()] = int(limit)
+    return limits
+
+
+# 江苏站点本身要求慢速访问，默认逐条抓取
+DETAIL_CONCURRENCY_HOSTS = _parse_host_limits(config.get("DETAIL_CONCURRENCY_HOSTS", "lyj.jiangsu.gov.cn=1"))
+
+_executors_lock = threading.Lock()
+_executors = {}
+
+
+def detail_limit(host):
+    """返回某主机允许的详情页并发数"""
+    return max(DETAIL_CONCURRENCY_HOSTS.get(host, DETAIL_CONCURRENCY), 1)
+
+
+def _executor_for(url):
+    host = urlsplit(url).hostname or ""
+    with _executors_lock:
+        executor = _executors.get(host)
+        if executor is None:
+            executor = ThreadPoolExecutor(max_workers=detail_limit(host), thread_name_prefix=f"detail-{host}")
+            _executors[host] = executor
+    return executor
+
+
+def submit_detail(url, func, *args):
+    """把详情页任务提交到 url 所在主机的线程池，返回 Future；任务沿用提交方的上下文（如重试预算）"""
+    return _executor_for(url).submit(contextvars.copy_context().run, func, *args)
+
+
+def _snippet_stable(previous, result, open_spans):
+    """连续两次解析的前 CONTENT_LENGTH + SNIPPET_MARGIN 个字符一致，且已超过 CONTENT_LENGTH；
+    这一范围内还有清洗规则的起始词没找到结束词时，读到结束词后摘要还会变化，不算稳定"""
+    if not isinstance(previous, str) or not isinstance(result, str) or len(result) <= CONTENT_LENGTH:
+        return False
+    window = CONTENT_LENGTH + SNIPPET_MARGIN
+    if any(position < window for position in open_spans):
+        return False
+    return result[:window] == previous[:window]
+
+
+def parse_snippet(func, url):
+    """截断模式：详情页边下载边解析，每次多读一倍后用同一个解析函数重新解析已读到的部分，
+    摘要稳定后关闭连接，不再下载剩余内容；读完整页时结果与普通模式相同"""
+    with transport.snippet_stream(url) as stream:
+        previous = None
+        while True:
+            with text_clean.track_open_spans() as open_spans:
+                try:
+                    result = func(url)
+                except Exception:
+                    # 页面只读了一部分时，解析函数可能因为元素还没出现而出错
+                    if stream.done:
+                        raise
+                    result = None
+            if stream.done or _snippet_stable(previous, result, open_spans):
+                return result
+            previous = result
+            stream.grow()
+
+
+def _parse(func, news, takes_item=False):
+    """解析一条新闻的详情页；takes_item 为真时解析函数接收整条新闻而不是 url"""
+    url = news["url"]
+    parse = (lambda _url: func(news)) if takes_item else func
+    return parse_snippet(parse, url) if SNIPPET_MODE else parse(url)
+
+
+def _fetch_and_store(func, news, parser, takes_item=False):
+    with transport.track_responses() as statuses:
+        text = _parse(func, news, takes_item)
+    # 只缓存成功响应解析出的非空正文
+    if text and isinstance(text, str) and statuses and all(200 <= status < 300 for status in statuses):
+        date = str(news["date"])[:10] if news.get("date") else None
+        article_cache.cache.put(news["url"], parser, text, news.get("title"), date)
+    return text
+
+
+def fetch_detail(func, news, takes_item=False):
+    """抓取一条新闻的详情页，返回 Future；文章缓存命中时不再发请求。
+    takes_item 为真时解析函数接收整条新闻（如需要列表页上的标题与日期）"""
+    url = news["url"]
+    if not article_cache.ENABLED:
+        return submit_detail(url, _parse, func, news, takes_item)
+    parser = article_cache.parser_key(func, SNIPPET_MODE)
+    text = article_cache.cache.get(url, parser)
+    if text is not None:
+        future = Future()
+        future.set_result(text)
+        return future
+    return submit_detail(url, _fetch_and_store, func, news, parser, takes_item)
+
+
+def fetch_details(func, news_list, takes_item=False):
+    """并发抓取一组新闻的详情页，返回与 news_list 顺序一致的 Future 列表"""
+    return [fetch_detail(func, news, takes_item) for news in news_list]
+
+
+def crawl_pages(page_urls, parse_list, parse_detail, takes_item=False):
+    """流水线抓取一个栏目：第 N 页的详情页在后台下载时即开始请求第 N+1 页列表，
+    直到某页没有时间范围内的新闻；返回按列表顺序排列的 (条目, 详情 Future)。
+    parse_list 可返回第三项，为真表示本页最后一条已超出时间范围，之后不再翻页；takes_item 同 fetch_detail。
+    增量模式下以第一页 URL 为栏目记录水位线，已读到的条目以连续 KNOWN_RUN 条上次已见过的新闻结尾时停止翻页；
+    置顶的旧闻后面还有新条目，不会因此停止"""
+    details = []
+    crawled = []
+    column = None
+    known = {}
+    known_run = 0  # 已读到的条目末尾连续的已见过条目数
+    for page_url in page_urls:
+        if column is None:
+            column = page_url
+            known = watermarks.store.known_items(column) if watermarks.INCREMENTAL else {}
+        result = parse_list(page_url)
+        news_list, has_recent_news = result[:2]
+        if not has_recent_news:
+            break
+        crawled += news_list
+        details += zip(news_list, fetch_details(parse_detail, news_list, takes_item))
+        for news in news_list:
+            known_run = known_run + 1 if news["url"] in known else 0
+        if known_run >= KNOWN_RUN:
+            # 之后的条目上次都已抓过，直接沿用记录，不再翻页
+            crawled_urls = {news["url"] for news in crawled}
+            remembered = [news for url, news in known.items() if url not in crawled_urls]
+            crawled += remembered
+            details += zip(remembered, fetch_details(parse_detail, remembered, takes_item))
+            watermarks.store.record_early_stop()
+            break
+        if len(result) > 2 and dates.stop_paging(result[2]):
+            break
+    if watermarks.INCREMENTAL and column is not None:
+        watermarks.store.update(column, crawled)
+    return details
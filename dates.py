@@ -0,0 +1,84 @@
+"""
+发布日期解析：许多省级 CMS 的详情页 URL 里带有发布日期（如 /t20241015_、/202410/），
+列表页先按 URL 判断条目是否已超出时间范围，超出的直接跳过，不再对 <li> 文本做正则与 strptime；
+文本日期的解析结果按字符串缓存。列表按日期倒序时，本页最后一条已超出时间范围即可停止翻页，
+省去多抓的一页（只用于声明了列表容器的站点，见 engine.ListRule 的 container）
+"""
+import calendar
+import re
+import threading
+from datetime import datetime, timedelta
+from functools import lru_cache
+
+import config
+
+URL_DATE_SLACK_DAYS = config.get_int("URL_DATE_SLACK_DAYS", 1)  # URL 日期与列表显示日期允许相差的天数
+PAGINATION_EARLY_STOP = config.get("PAGINATION_EARLY_STOP", "1") == "1"  # 本页最后一条超出时间范围时停止翻页
+
+# === URL 日期格式 ===
+# 每种格式匹配出 (年, 月, 日)，只精确到月的格式日取 None
+TRS_DAY = re.compile(r"/t(20\d{2})(0[1-9]|1[0-2])(\d{2})_")           # .../202410/t20241015_123456.html
+ART_DAY = re.compile(r"/art/(20\d{2})/(\d{1,2})/(\d{1,2})/")          # .../art/2024/10/15/art_7197_123456.html
+MONTH_DIR = re.compile(r"/(20\d{2})(0[1-9]|1[0-2])/()")               # .../202410/c00_123456.shtml
+
+_lock = threading.Lock()
+_stats = {"url_dates": 0, "url_skipped": 0, "early_stops": 0}
+
+
+def url_date(href, patterns):
+    """按站点声明的格式从 URL 取出发布日期的上界：精确到日的取当天，只精确到月的取当月最后一天；
+    取不到返回 None"""
+    for pattern in patterns:
+        match = pattern.search(href)
+        if not match:
+            continue
+        year, month, day = match.groups()
+        year, month = int(year), int(month)
+        try:
+            if day:
+                return datetime(year, month, int(day))
+            return datetime(year, month, calendar.monthrange(year, month)[1])
+        except ValueError:
+            continue
+    return None
+
+
+def url_is_stale(href, patterns, days_ago_date):
+    """URL 中的日期（加上允许的误差）仍早于时间范围时返回 True，调用方可直接跳过该条目"""
+    if not patterns:
+        return False
+    date = url_date(href, patterns)
+    if date is None:
+        return False
+    stale = date + timedelta(days=URL_DATE_SLACK_DAYS) < days_ago_date
+    with _lock:
+        _stats["url_dates"] += 1
+        _stats["url_skipped"] += stale
+    return stale
+
+
+# === 文本日期 ===
+@lru_cache(maxsize=4096)
+def parse_date(text, fmt="%Y-%m-%d"):
+    """带缓存的 datetime.strptime；列表里的日期大量重复，解析失败同样抛出 ValueError"""
+    return datetime.strptime(text, fmt)
+
+
+# === 翻页 ===
+def stop_paging(reached_stale):
+    """列表页解析函数返回的第三项为真（本页最后一条已超出时间范围）时，判断是否不再翻页"""
+    if not (PAGINATION_EARLY_STOP and reached_stale):
+        return False
+    with _lock:
+        _stats["early_stops"] += 1
+    return True
+
+
+def date_stats():
+    cache = parse_date.cache_info()
+    with _lock:
+        return {
+            **_stats,
+            "early_stop_enabled": PAGINATION_EARLY_STOP,
+            "parse_cache": {"hits": cache.hits, "misses": cache.misses, "size": cache.currsize},
+        }
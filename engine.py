@@ -0,0 +1,251 @@
+"""
+通用抓取引擎：各省模块只声明一个 Site（起始页、翻页模板、列表与正文的解析规则、展示格式），
+由 run(site) 统一完成请求、翻页、详情并发与结果整理；
+连接池、缓存、并发与统计都在这里接入，对所有省份同时生效
+"""
+import itertools
+import re
+import time
+from collections import namedtuple
+from datetime import datetime, timedelta
+from urllib.parse import urljoin
+
+import config
+import crawler
+import dates
+import extractor
+import html_parser
+import metrics
+import transport
+
+CONTENT_LENGTH = config.CONTENT_LENGTH
+DAYS_AGO = config.DAYS_AGO
+
+# 按浏览器 UA 请求，编码取响应头，非 2xx 时抛错
+BROWSER_REQUEST = {"user_agent": transport.CHROME_UA, "charset": "header", "raise_for_status": True}
+# 正文区域里默认删除的标签
+NOISE_TAGS = ("nav", "header", "footer", "aside", "script", "style")
+# 含这些词的段落是面包屑导航
+BREADCRUMB_KEYWORDS = ("您当前的位置", "首页 >", "林草资讯")
+
+# === 站点配置 ===
+# 展示格式：超过 CONTENT_LENGTH 时截断并加 "..."；prefix 加在正文前，only_truncated 时只加在截断的正文前；
+# flatten 为真时去掉正文中的换行，only_truncated 时只去掉截断的正文中的换行
+Display = namedtuple("Display", "prefix only_truncated flatten", defaults=("", False, False))
+
+# code / name：省份代码与名称；start_urls：各栏目起始页
+# pages：翻页函数 (起始页, 页码) -> 地址，为 None 时只抓起始页
+# list_rule：ListRule，或站点自己的列表解析函数 (url, days_ago_date) -> (条目, 是否有时间范围内的新闻)
+# detail：ContentRule，或站点自己的详情解析函数 (url) -> 完整正文；detail_takes_item 为真时传入整条新闻
+# display：Display，返回接口时整理正文的格式
+# request：传给 transport.get_text 的参数；skip_list_errors：列表页出错时只结束该栏目，不影响整个省份
+Site = namedtuple(
+    "Site",
+    "code name start_urls pages list_rule detail display request skip_list_errors detail_takes_item",
+    defaults=(Display(), {}, False, False),
+)
+
+# strainer：列表页只解析的部分；url_date：详情页 URL 中的发布日期格式（见 dates）
+# 日期默认在 <li> 文本中按 date_pattern 查找；给出 date_tag 时取该标签的文本
+# container：条目所在的容器（soup.find 的参数），不给时在整页查找 <li>；给出时本页最后一条超出时间范围即停止翻页
+ListRule = namedtuple(
+    "ListRule",
+    "strainer url_date date_pattern date_format date_tag container",
+    defaults=((), r"\d{4}-\d{2}-\d{2}", "%Y-%m-%d", None, None),
+)
+
+# 用 extractor 定位正文：删除 strip_tags 标签与含 drop_keywords 的段落后取文本，再按 cleaner 清洗；
+# drop_surrogates 为真时去掉无法按 UTF-8 编码的字符
+ContentRule = namedtuple(
+    "ContentRule",
+    "cleaner strip_tags drop_keywords drop_surrogates",
+    defaults=(NOISE_TAGS, (), False),
+)
+
+# 一条新闻：省份代码、详情页地址、标题、发布日期（YYYY-MM-DD）与清洗后的完整正文；
+# 截断与展示格式在返回接口时才由 display 处理
+Article = namedtuple("Article", "province url title date text")
+
+
+# === 翻页模板 ===
+def template_pages(first, rest, offset=0):
+    """第 1 页用 first，之后用 rest；{n} 为页码加 offset，{url} 为起始页，
+    {stem} 为去掉末尾 .html 或 / 的起始页"""
+    def page_url(url, page):
+        stem = url[:-len(".html")] if url.endswith(".html") else url.rstrip("/")
+        return (first if page == 1 else rest).format(url=url, stem=stem, n=page + offset)
+    return page_url
+
+
+def replace_pages(old, new):
+    """把起始页地址中的 old 换成 new（{n} 为页码），如 "page=1" -> "page={n}" """
+    return lambda url, page: url.replace(old, new.format(n=page))
+
+
+# === 请求与解析 ===
+def request(site, url, conditional=False):
+    """按站点的请求参数获取页面文本"""
+    return transport.get_text(url, conditional=conditional, **site.request)
+
+
+def parse_list(site, url, days_ago_date):
+    """按 ListRule 解析列表页，返回 (时间范围内的条目, 是否有时间范围内的新闻, 本页最后一条是否已超出时间范围)"""
+    rule = site.list_rule
+    html = request(site, url, conditional=True)
+    soup = html_parser.make_soup(html, site.code, parse_only=rule.strainer)
+    news_list = []
+    has_recent_news = False
+    reached_stale = False
+
+    if rule.container:
+        soup = soup.find(**rule.container)
+        if not soup:
+            return news_list, has_recent_news, reached_stale
+
+    for li in soup.find_all("li"):
+        a_tag = li.find("a")
+        if not a_tag:
+            continue
+        href = urljoin(url, a_tag.get("href"))
+        if dates.url_is_stale(href, rule.url_date, days_ago_date):
+            reached_stale = True
+            continue
+        if rule.date_tag:
+            date_tag = li.find(**rule.date_tag)
+            if not date_tag:
+                continue
+            date_text = date_tag.text.strip()
+        else:
+            date_match = re.search(rule.date_pattern, li.text)
+            if not date_match:
+                continue
+            date_text = date_match.group()
+        try:
+            news_date = dates.parse_date(date_text, rule.date_format)
+        except ValueError:
+            continue
+        reached_stale = news_date < days_ago_date
+        if news_date >= days_ago_date:
+            title = a_tag.get("title", "").strip() or a_tag.get_text(strip=True)
+            news_list.append({"url": href, "date": news_date, "title": title})
+            has_recent_news = True
+    # 不限定列表容器时整页的 <li> 都会被检查，侧栏、页脚里的旧日期不代表新闻列表已经到头，
+    # 只有声明了 container 的站点才据此提前停止翻页
+    return news_list, has_recent_news, reached_stale and rule.container is not None
+
+
+def parse_content(site, url):
+    """按 ContentRule 解析详情页并返回正文，找不到正文或出错时返回 None"""
+    rule = site.detail
+    try:
+        html = request(site, url)
+        soup = html_parser.make_soup(html, site.code)
+
+        content_div = extractor.find_content_div(soup)
+        if not content_div:
+            return None
+
+        for element in content_div.find_all(list(rule.strip_tags)):
+            element.decompose()
+        if rule.drop_keywords:
+            for p in content_div.find_all("p"):
+                if any(keyword in p.get_text() for keyword in rule.drop_keywords):
+                    p.decompose()
+
+        text = content_div.get_text(separator="\n", strip=True)
+        text = rule.cleaner(text)
+        if rule.drop_surrogates:
+            text = text.encode("utf-8", errors="ignore").decode("utf-8")
+        return text
+
+    except Exception as e:
+        print(f"获取新闻详情失败: {e}")
+        return None
+
+
+def _flatten(text):
+    return text.replace("\n", "").replace("\r", "")
+
+
+def display(site, article, length=None):
+    """按站点的展示格式整理一条新闻的正文，超过 length（默认 CONTENT_LENGTH）时截断"""
+    length = length or CONTENT_LENGTH
+    prefix, only_truncated, flatten = site.display
+    text = article.text
+    if flatten and not only_truncated:
+        text = _flatten(text)
+    if len(text) > length:
+        return prefix + (_flatten(text) if flatten else text)[:length] + "..."
+    return text if only_truncated else prefix + text
+
+
+def make_article(site, news, text):
+    """由列表页条目与详情页正文组成 Article"""
+    date = news.get("date")
+    return Article(site.code, news["url"], news.get("title") or "", str(date)[:10] if date else "", text)
+
+
+def _list_parser(site, days_ago_date):
+    def parse_list_page(url):
+        try:
+            with metrics.scope(phase="list"):
+                if isinstance(site.list_rule, ListRule):
+                    return parse_list(site, url, days_ago_date)
+                return site.list_rule(url, days_ago_date)
+        except Exception:
+            if site.skip_list_errors:
+                return [], False
+            raise
+    return parse_list_page
+
+
+def _detail_parser(site):
+    if not isinstance(site.detail, ContentRule):
+        return site.detail
+
+    def parse_detail(url):
+        return parse_content(site, url)
+    # 文章缓存按解析函数的名称区分，各省使用各自的名称
+    parse_detail.__name__ = f"parse_news_detail_{site.code}"
+    return parse_detail
+
+
+# === 抓取 ===
+def run(site):
+    """抓取一个省份的全部栏目，返回 Article 列表；耗时与文章数计入 metrics"""
+    print(f"{site.code}{site.name}数据采集开始")
+    started = time.perf_counter()
+    # 详情页任务复制提交时的上下文，因此列表页以外的请求都记在 detail 阶段
+    try:
+        with metrics.scope(province=site.code, phase="detail"):
+            articles = _run(site)
+    finally:
+        metrics.PROVINCE_SECONDS.observe(time.perf_counter() - started, province=site.code)
+    metrics.ARTICLES.inc(len(articles), province=site.code)
+    print(f"{site.code}{site.name}     ", len(articles))
+    return articles
+
+
+def _run(site):
+    days_ago_date = datetime.now() - timedelta(days=DAYS_AGO)
+    parse_list_page = _list_parser(site, days_ago_date)
+    parse_detail = _detail_parser(site)
+
+    details = []
+    for start_url in site.start_urls:
+        if site.pages is None:
+            news_list = parse_list_page(start_url)[0]
+            details += zip(news_list, crawler.fetch_details(parse_detail, news_list, site.detail_takes_item))
+        else:
+            page_urls = (site.pages(start_url, page) for page in itertools.count(1))
+            details += crawler.crawl_pages(page_urls, parse_list_page, parse_detail, site.detail_takes_item)
+
+    articles = []
+    for news, future in details:
+        try:
+            text = future.result()
+        except Exception:
+            continue
+        if text:
+            articles.append(make_article(site, news, text))
+    return articles
@@ -0,0 +1,34 @@
+"""
+正文定位：按各省原有规则（文字超过 200 且多于 3 行的第一个 div）选出正文区域，整篇文档只遍历一遍。
+子孙 div 的文字是外层 div 文字的一部分，外层不满足条件时子孙也不可能满足，
+因此整棵子树直接跳过；原来对每个 div 调用 get_text() 会反复拼接嵌套子树的文字，
+在没有 div 满足条件的页面（如压缩成一行的 HTML）上耗时随嵌套深度成倍增加
+"""
+from bs4 import Tag
+
+MIN_LENGTH = 200
+MIN_LINES = 4
+
+
+def _after_subtree(tag):
+    """返回文档顺序中紧跟在 tag 整棵子树之后的节点"""
+    while tag is not None:
+        if tag.next_sibling is not None:
+            return tag.next_sibling
+        tag = tag.parent
+    return None
+
+
+def find_content_div(soup, min_length=MIN_LENGTH, min_lines=MIN_LINES):
+    """返回文档顺序中第一个文字超过 min_length 且不少于 min_lines 行的 div，没有则返回 None"""
+    div = soup.find('div')
+    while div is not None:
+        text = div.get_text().strip()
+        if len(text) > min_length and text.count('\n') + 1 >= min_lines:
+            return div
+        node = _after_subtree(div)
+        if node is None or (isinstance(node, Tag) and node.name == 'div'):
+            div = node
+        else:
+            div = node.find_next('div')
+    return None
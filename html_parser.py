@@ -0,0 +1,55 @@
+"""
+HTML 解析器选择：各省统一通过 make_soup 构建 BeautifulSoup，解析后端可按省份配置
+（lxml / html5lib / html.parser），配置的后端未安装时回退到 html.parser
+"""
+import time
+
+from bs4 import BeautifulSoup, FeatureNotFound
+
+import config
+import metrics
+
+FALLBACK = "html.parser"
+BACKENDS = ("lxml", "html5lib", "html.parser")
+
+
+def _parse_site_parsers(value):
+    """解析 "13=lxml,65=html5lib" 形式的配置，键为省份代码"""
+    parsers = {}
+    for item in value.split(","):
+        if "=" not in item:
+            continue
+        site, backend = item.split("=", 1)
+        parsers[site.strip()] = backend.strip()
+    return parsers
+
+
+DEFAULT_PARSER = config.get("HTML_PARSER", FALLBACK)  # 未单独配置的省份使用的解析器
+SITE_PARSERS = _parse_site_parsers(config.get("HTML_PARSER_SITES", ""))
+
+_unavailable = set()
+
+
+def parser_for(site):
+    """返回省份配置的解析器名称"""
+    return SITE_PARSERS.get(site, DEFAULT_PARSER)
+
+
+def make_soup(html, site=None, parse_only=None):
+    """用省份配置的解析器构建 BeautifulSoup，耗时计入 metrics"""
+    started = time.perf_counter()
+    soup = _build_soup(html, site, parse_only)
+    metrics.PARSE_SECONDS.observe(time.perf_counter() - started, **metrics.labels())
+    return soup
+
+
+def _build_soup(html, site, parse_only):
+    """解析器未安装时回退到 html.parser"""
+    backend = parser_for(site)
+    if backend != FALLBACK and backend not in _unavailable:
+        try:
+            return BeautifulSoup(html, backend, parse_only=parse_only)
+        except FeatureNotFound:
+            _unavailable.add(backend)
+            print(f"⚠️ 解析器 {backend} 未安装，回退到 {FALLBACK}")
+    return BeautifulSoup(html, FALLBACK, parse_only=parse_only)
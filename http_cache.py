@@ -0,0 +1,107 @@
+"""
+HTTP 条件请求缓存：把列表页的 ETag / Last-Modified 与解码后的正文保存到本地 SQLite，
+再次请求时带上 If-None-Match / If-Modified-Since，服务端返回 304 时直接复用缓存的正文
+"""
+import os
+import sqlite3
+import threading
+import time
+from collections import namedtuple
+from urllib.parse import urlsplit
+
+import config
+from article_cache import canonical_url
+
+ENABLED = config.get("HTTP_CACHE", "1") != "0"
+CACHE_PATH = config.get("HTTP_CACHE_PATH", "cache/http.sqlite3")
+TTL_DAYS = config.get_float("HTTP_CACHE_TTL_DAYS", 7)  # 超过此天数未更新的页面不再发条件请求
+
+CachedPage = namedtuple("CachedPage", "etag last_modified text size")
+
+
+def validators(page):
+    """根据缓存的页面生成条件请求头"""
+    headers = {}
+    if page.etag:
+        headers["If-None-Match"] = page.etag
+    if page.last_modified:
+        headers["If-Modified-Since"] = page.last_modified
+    return headers
+
+
+class HttpCache:
+    def __init__(self, path=CACHE_PATH, ttl_days=TTL_DAYS):
+        self.path = path
+        self.ttl = ttl_days * 86400
+        self._lock = threading.Lock()
+        self._conn = None
+        self._host_stats = {}
+
+    def _connect(self):
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS pages ("
+                " url TEXT PRIMARY KEY, etag TEXT, last_modified TEXT,"
+                " text TEXT NOT NULL, size INTEGER NOT NULL, stored_at REAL NOT NULL)"
+            )
+            conn.execute("DELETE FROM pages WHERE stored_at < ?", (time.time() - self.ttl,))
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def _count(self, url, key, amount=1):
+        host = urlsplit(url).hostname or ""
+        stats = self._host_stats.setdefault(
+            host, {"conditional": 0, "not_modified": 0, "bytes_downloaded": 0, "bytes_saved": 0}
+        )
+        stats[key] += amount
+
+    def get(self, url):
+        """返回缓存的页面；没有缓存时返回 None"""
+        with self._lock:
+            row = self._connect().execute(
+                "SELECT etag, last_modified, text, size FROM pages WHERE url = ? AND stored_at >= ?",
+                (canonical_url(url), time.time() - self.ttl),
+            ).fetchone()
+            if row is None:
+                return None
+            self._count(url, "conditional")
+            return CachedPage(*row)
+
+    def put(self, url, resp, text):
+        """保存带校验信息的 200 响应；服务端不提供 ETag / Last-Modified 时不缓存"""
+        etag = resp.headers.get("ETag")
+        last_modified = resp.headers.get("Last-Modified")
+        with self._lock:
+            self._count(url, "bytes_downloaded", len(resp.content))
+            if not etag and not last_modified:
+                return
+            conn = self._connect()
+            conn.execute(
+                "INSERT OR REPLACE INTO pages (url, etag, last_modified, text, size, stored_at)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (canonical_url(url), etag, last_modified, text, len(resp.content), time.time()),
+            )
+            conn.commit()
+
+    def not_modified(self, url, page):
+        """记录一次 304 响应，并刷新缓存的有效期"""
+        with self._lock:
+            self._count(url, "not_modified")
+            self._count(url, "bytes_saved", page.size)
+            conn = self._connect()
+            conn.execute("UPDATE pages SET stored_at = ? WHERE url = ?", (time.time(), canonical_url(url)))
+            conn.commit()
+
+    def stats(self):
+        """返回每个主机的条件请求数、304 次数、下载字节数与节省的字节数"""
+        with self._lock:
+            return {"enabled": ENABLED, "hosts": {host: dict(stats) for host, stats in self._host_stats.items()}}
+
+
+cache = HttpCache()
@@ -1,44 +1,50 @@
 import asyncio
+import contextvars
+import json
 import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from contextlib import asynccontextmanager
-from fastapi import FastAPI, Request
+from fastapi import FastAPI, Query, Request
 from starlette.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 import uvicorn
-from _13hebei import fetch_hebei_news
-from _14sanxi import fetch_shnxi_news
-from _15neimenggu import fetch_neimenggu_news
-from _21liaoning import fetch_liaoning_news
-from _22jilin import fetch_jilin_news
-from _23heilongjiang import fetch_heilongjiang_news
-from _32jiangsu import fetch_jiangsu_news
-from _33zhejiang import fetch_zhejiang_news
-from _35fujian import fetch_fujian_news
-from _41henan import fetch_henan_news
-from _44guangdong import fetch_guangdong_news
-from _46hainan import fetch_hainan_news
-from _50chongqing import fetch_chongqing_news
-from _52guizhou import fetch_guizhou_news
-from _53yunan import fetch_yunnan_news
-from _54xizang import fetch_xizang_news
-from _61shanxi import fetch_shanxi_news
-from _63qinghai import fetch_qinghai_news
-from _64ningxia import fetch_ningxia_news
-from _65xinjiang import fetch_xinjiang_news
+import article_cache
+import config
+import dates
+import http_cache
+import metrics
+import sites
+import watermarks
+from snapshot import NewsSnapshot
+
+FETCH_WORKERS = config.get_int("FETCH_WORKERS", 8)          # 并发抓取的省份数
+PROVINCE_TIMEOUT = config.get_float("PROVINCE_TIMEOUT", 120)  # 单个省份的抓取时限（秒）
+TOTAL_TIMEOUT = config.get_float("TOTAL_TIMEOUT", 180)        # 整次请求的抓取时限（秒）
+
+# === 省份列表（按返回顺序），各省模块在第一次抓取时才导入 ===
+PROVINCES = sites.PROVINCES
+
+
+def province_breakers(provinces=PROVINCES):
+    """各省份主机的熔断状态；尚未抓取过的省份为空"""
+    import circuit_breaker
+    return {province.code: circuit_breaker.breaker_states(sites.hosts(province.code)) for province in provinces}
 
 
 # === FastAPI 应用生命周期 ===
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     print("应用启动中...")
+    refresh_task = asyncio.create_task(news_snapshot.run_forever())
     yield
+    refresh_task.cancel()
     print("应用关闭中...")
 
 
 # === 初始化 FastAPI 应用 ===
 app = FastAPI(lifespan=lifespan)
-config = uvicorn.Config(app, host="0.0.0.0", port=8000, log_level="info")
-server = uvicorn.Server(config)
+uvicorn_config = uvicorn.Config(app, host="0.0.0.0", port=8000, log_level="info")
+server = uvicorn.Server(uvicorn_config)
 
 # === CORS 设置 ===
 app.add_middleware(
@@ -54,7 +60,12 @@ app.add_middleware(
 @app.middleware("http")
 async def log_requests(request: Request, call_next):
     print(f"收到请求：{request.method} {request.url}")
+    started = time.perf_counter()
     response = await call_next(request)
+    # 按路由模板记录，避免 /query_news_list/{province} 每个省份一组指标
+    route = request.scope.get("route")
+    metrics.HTTP_SECONDS.observe(time.perf_counter() - started, method=request.method,
+                                 path=route.path if route else "unmatched", status=response.status_code)
     return response
 
 
@@ -64,6 +75,30 @@ async def read_root():
     return JSONResponse({"message": "Hello, World!"})
 
 
+# === 抓取统计 ===
+@app.get("/crawl_stats")
+async def crawl_stats():
+    import charset_resolver
+    import transport
+    return JSONResponse({
+        "snapshot": news_snapshot.stats(),
+        "breakers": province_breakers(),
+        "transport": transport.transport_stats(),
+        "snippet": transport.snippet_stats(),
+        "charset": charset_resolver.charset_stats(),
+        "dates": dates.date_stats(),
+        "article_cache": article_cache.cache.stats(),
+        "http_cache": http_cache.cache.stats(),
+        "watermarks": watermarks.store.stats(),
+    })
+
+
+# === Prometheus 指标 ===
+@app.get("/metrics")
+async def metrics_endpoint():
+    return Response(metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+
 # === 关闭 FastAPI 服务 ===
 async def shutdown_server():
     print("🔻正在关闭 FastAPI 服务...")
@@ -72,67 +107,206 @@ async def shutdown_server():
 
 
 # === 返回爬虫数据 ===
-def safe_fetch(fetch_func, retries=3, delay=2):
-    for i in range(retries):
-        try:
-            result = fetch_func()
-            if result is not None:
-                return result
-        except Exception as e:
-            print(f"⚠️ 第 {i+1} 次调用 {fetch_func.__name__} 失败：{e}")
-            time.sleep(delay)
-    print(f"❌ 跳过：{fetch_func.__name__}")
-    return []
+def safe_fetch(province):
+    """抓取单个省份，失败时返回 None；请求级的重试已在 transport 中完成，这里不再整省重抓"""
+    try:
+        result = sites.run(province.code)
+    except Exception as e:
+        print(f"❌ 跳过：{province.code}{province.name}，{e}")
+        return None
+    return result if result is not None else []
+
+
+def crawl_all(provinces=PROVINCES, workers=None, province_timeout=None, total_timeout=None, on_province=None):
+    """并发抓取各省新闻，返回 (Article 列表, 各省状态)；超出时限的省份不再等待。
+    每个省份结束（完成、超时或跳过）时调用 on_province(代码, Article 列表, 状态)"""
+    import circuit_breaker
+    import transport
+
+    workers = workers or FETCH_WORKERS
+    province_timeout = province_timeout or PROVINCE_TIMEOUT
+    total_timeout = total_timeout or TOTAL_TIMEOUT
+
+    started = time.monotonic()
+    deadline = started + total_timeout
+    start_times = {}
+
+    def run(province):
+        start_times[province.code] = time.monotonic()
+        return safe_fetch(province)
+
+    def finish(code, news_list, state):
+        results[code] = news_list
+        status[code] = state
+        if on_province:
+            on_province(code, news_list, state)
+
+    executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="province")
+    # 本次抓取的所有请求共享一份重试预算
+    with transport.retry_budget():
+        futures = {
+            executor.submit(contextvars.copy_context().run, run, province): province.code
+            for province in provinces
+        }
+    results = {}
+    status = {}
+    pending = set(futures)
+    try:
+        while pending:
+            now = time.monotonic()
+            # 单省超时：已开始运行且超过 province_timeout 的省份直接放弃
+            for future in list(pending):
+                code = futures[future]
+                begun = start_times.get(code)
+                if begun is not None and now - begun >= province_timeout:
+                    pending.discard(future)
+                    finish(code, [], {"status": "timeout", "count": 0, "elapsed": round(now - begun, 2)})
+            if not pending or now >= deadline:
+                break
+
+            next_deadline = min([deadline] + [
+                start_times[futures[f]] + province_timeout for f in pending if futures[f] in start_times
+            ])
+            done, pending = wait(pending, timeout=max(0.0, next_deadline - now), return_when=FIRST_COMPLETED)
+            for future in done:
+                code = futures[future]
+                news_list = future.result()
+                if news_list is not None:
+                    outcome = "ok"
+                elif any(b["state"] != circuit_breaker.CLOSED
+                         for b in circuit_breaker.breaker_states(sites.hosts(code)).values()):
+                    outcome = "circuit_open"
+                else:
+                    outcome = "error"
+                finish(code, news_list or [], {
+                    "status": outcome,
+                    "count": len(news_list or []),
+                    "elapsed": round(time.monotonic() - start_times[code], 2),
+                })
+
+        # 总时限耗尽：正在运行的记为超时，尚未开始的记为跳过
+        now = time.monotonic()
+        for future in pending:
+            code = futures[future]
+            begun = start_times.get(code)
+            if begun is None:
+                finish(code, [], {"status": "skipped", "count": 0, "elapsed": 0})
+            else:
+                finish(code, [], {"status": "timeout", "count": 0, "elapsed": round(now - begun, 2)})
+    finally:
+        # 不等待超时的线程结束，未开始的任务直接取消
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    for province in provinces:
+        if status[province.code]["status"] != "ok":
+            print(f"⚠️ {province.code}{province.name} 未完成：{status[province.code]['status']}")
+
+    result = [news for province in provinces for news in results.get(province.code, [])]
+    return result, {province.code: status[province.code] for province in provinces}
+
+
+def render_news(articles, length=None):
+    """把 Article 整理成接口返回的文本：按各省的展示格式加前缀并截断到 length（默认 CONTENT_LENGTH）"""
+    import engine
+    return [engine.display(sites.load(article.province), article, length) for article in articles]
+
+
+def crawl_provinces(codes=None, on_province=None):
+    """抓取指定代码的省份，codes 为 None 时抓取全部"""
+    if codes is None:
+        return crawl_all(on_province=on_province)
+    return crawl_all([province for province in PROVINCES if province.code in codes], on_province=on_province)
+
+
+def parse_provinces(value):
+    """解析逗号分隔的省份代码，按返回顺序排列；返回 (代码列表, 无法识别的代码)"""
+    codes = {code.strip() for code in value.split(",") if code.strip()}
+    unknown = sorted(codes - sites.BY_CODE.keys())
+    return [province.code for province in PROVINCES if province.code in codes], unknown
+
+
+news_snapshot = NewsSnapshot(crawl_provinces, render_news)
 
 
 @app.get("/query_news_list")
-def query_news_list():
-    hebei_news_list = safe_fetch(fetch_hebei_news)
-    sanxi_news_list = safe_fetch(fetch_shnxi_news)
-    neimenggu_news_list = safe_fetch(fetch_neimenggu_news)
-    liaoning_news_list = safe_fetch(fetch_liaoning_news)
-    jilin_news_list = safe_fetch(fetch_jilin_news)
-    heilongjiang_news_list = safe_fetch(fetch_heilongjiang_news)
-    jiangsu_news_list = safe_fetch(fetch_jiangsu_news)
-    zhejiang_news_list = safe_fetch(fetch_zhejiang_news)
-    fujian_news_texts = safe_fetch(fetch_fujian_news)
-    henan_news_list = safe_fetch(fetch_henan_news)
-    guangdong_news_list = safe_fetch(fetch_guangdong_news)
-    hainan_news_list = safe_fetch(fetch_hainan_news)
-    chongqing_news_list = safe_fetch(fetch_chongqing_news)
-    guizhou_news_list = safe_fetch(fetch_guizhou_news)
-    yunnan_news_list = safe_fetch(fetch_yunnan_news)
-    xizang_news_list = safe_fetch(fetch_xizang_news)
-    shanxi_news_list = safe_fetch(fetch_shanxi_news)
-    qinghai_news_list = safe_fetch(fetch_qinghai_news)
-    ningxia_news_list = safe_fetch(fetch_ningxia_news)
-    xinjiang_news_list = safe_fetch(fetch_xinjiang_news)
-
-    result = [
-        *hebei_news_list,
-        *sanxi_news_list,
-        *neimenggu_news_list,
-        *liaoning_news_list,
-        *jilin_news_list,
-        *heilongjiang_news_list,
-        *jiangsu_news_list,
-        *zhejiang_news_list,
-        *fujian_news_texts,
-        *henan_news_list,
-        *guangdong_news_list,
-        *hainan_news_list,
-        *chongqing_news_list,
-        *guizhou_news_list,
-        *yunnan_news_list,
-        *xizang_news_list,
-        *shanxi_news_list,
-        *qinghai_news_list,
-        *ningxia_news_list,
-        *xinjiang_news_list,
-    ]
-    print("result", result)
-
-    return result
+def query_news_list(max_age: float | None = None, provinces: str | None = None):
+    """返回后台抓取的新闻快照；快照早于 max_age 秒时先同步刷新。
+    provinces 为逗号分隔的省份代码（如 44,53）时只返回这些省份"""
+    if provinces:
+        return query_province_news(provinces, max_age)
+    snapshot = news_snapshot.get(max_age)
+    return Response(snapshot.body, media_type="application/json", headers=snapshot.headers())
+
+
+@app.get("/query_news_list/{province}")
+def query_province_news(province: str, max_age: float | None = None):
+    """返回一个或多个省份（逗号分隔的代码）的新闻；优先读取已有的抓取结果，
+    没有结果或结果早于 max_age 秒时只抓取这些省份"""
+    codes, unknown = parse_provinces(province)
+    if unknown or not codes:
+        return JSONResponse({"error": f"未知的省份代码：{','.join(unknown) or province}"}, status_code=404)
+    snapshot = news_snapshot.get_provinces(codes, max_age)
+    return Response(snapshot.body, media_type="application/json", headers=snapshot.headers())
+
+
+# === 流式返回 ===
+STREAM_MEDIA_TYPES = {"ndjson": "application/x-ndjson", "sse": "text/event-stream"}
+
+
+def stream_event(fmt, event, data):
+    """把一个事件编码为 NDJSON 的一行或一条 SSE 消息"""
+    payload = json.dumps({"type": event, **data}, ensure_ascii=False, separators=(",", ":"))
+    if fmt == "sse":
+        return f"event: {event}\ndata: {payload}\n\n"
+    return payload + "\n"
+
+
+async def stream_events(codes, max_age, fmt):
+    """在线程中按省份取得结果，每个省份结束后立即发出它的新闻与状态，最后发出汇总"""
+    loop = asyncio.get_running_loop()
+    queue = asyncio.Queue()
+
+    def emit(code, news, status):
+        loop.call_soon_threadsafe(queue.put_nowait, (code, news, status))
+
+    started = time.monotonic()
+    task = asyncio.ensure_future(asyncio.to_thread(news_snapshot.stream, codes, emit, max_age))
+    task.add_done_callback(lambda _: queue.put_nowait(None))
+    count = 0
+    status = {}
+    while (item := await queue.get()) is not None:
+        code, news, state = item
+        for article, text in zip(news, render_news(news)):
+            yield stream_event(fmt, "article", dict(article._asdict(), text=text))
+        count += len(news)
+        status[code] = state
+        yield stream_event(fmt, "province", {"province": code, **state})
+
+    summary = {"count": count, "status": status, "elapsed": round(time.monotonic() - started, 2)}
+    try:
+        await task
+    except Exception as e:
+        summary["error"] = str(e)
+    yield stream_event(fmt, "summary", summary)
+
+
+@app.get("/stream_news_list")
+async def stream_news_list(fmt: str = Query("ndjson", alias="format"), provinces: str | None = None,
+                           max_age: float | None = None):
+    """流式返回新闻：每个省份结束后立即发出它的新闻（article，每条一个事件）与状态（province），
+    最后发出汇总（summary）；format 为 ndjson（默认）或 sse，provinces 与 max_age 同 /query_news_list"""
+    if fmt not in STREAM_MEDIA_TYPES:
+        return JSONResponse({"error": f"不支持的格式：{fmt}"}, status_code=400)
+    codes = [province.code for province in PROVINCES]
+    if provinces:
+        codes, unknown = parse_provinces(provinces)
+        if unknown or not codes:
+            return JSONResponse({"error": f"未知的省份代码：{','.join(unknown) or provinces}"}, status_code=404)
+    return StreamingResponse(
+        stream_events(codes, max_age, fmt),
+        media_type=STREAM_MEDIA_TYPES[fmt],
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},  # 不让代理缓冲，事件立即到达客户端
+    )
 
 
 if __name__ == "__main__":
@@ -0,0 +1,129 @@
+"""
+Prometheus 指标：按省份、阶段（list / detail）与主机统计请求耗时、解析耗时、下载字节数、页数、重试、错误与文章数，
+以及接口自身的请求耗时；render() 输出 Prometheus 文本格式，不依赖 prometheus_client。
+省份与阶段由 scope() 放在 contextvars 中，复制了上下文的详情页线程同样带上这些标签
+"""
+import contextvars
+import threading
+from contextlib import contextmanager
+
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+PARSE_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1)
+
+_registry = []
+_scope = contextvars.ContextVar("metrics_scope", default={"province": "", "phase": ""})
+
+
+@contextmanager
+def scope(**labels):
+    """在此上下文中记录的抓取指标带上这些标签（province / phase）"""
+    token = _scope.set({**_scope.get(), **labels})
+    try:
+        yield
+    finally:
+        _scope.reset(token)
+
+
+def labels(**extra):
+    """当前上下文的 province、phase 标签，加上 extra"""
+    return {**_scope.get(), **extra}
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names, values, extra=()):
+    pairs = [f'{name}="{_escape(value)}"' for name, value in (*zip(names, values), *extra)]
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value):
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name, documentation, label_names=()):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        self._lock = threading.Lock()
+        self._values = {}
+        _registry.append(self)
+
+    def _key(self, labels):
+        return tuple(labels.get(name, "") for name in self.label_names)
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        with self._lock:
+            items = sorted(self._values.items())
+            lines += [line for key, value in items for line in self._render_sample(key, value)]
+        return lines
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def _render_sample(self, key, value):
+        return [f"{self.name}{_format_labels(self.label_names, key)} {_format_value(value)}"]
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name, documentation, label_names=(), buckets=LATENCY_BUCKETS):
+        super().__init__(name, documentation, label_names)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                entry = self._values[key] = [[0] * len(self.buckets), 0.0, 0]  # 各桶计数、总和、次数
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    entry[0][i] += 1
+            entry[1] += value
+            entry[2] += 1
+
+    def _render_sample(self, key, value):
+        counts, total, count = value
+        lines = [
+            f"{self.name}_bucket{_format_labels(self.label_names, key, [('le', _format_value(bound))])} {n}"
+            for bound, n in zip(self.buckets, counts)
+        ]
+        lines.append(f"{self.name}_bucket{_format_labels(self.label_names, key, [('le', '+Inf')])} {count}")
+        lines.append(f"{self.name}_sum{_format_labels(self.label_names, key)} {_format_value(total)}")
+        lines.append(f"{self.name}_count{_format_labels(self.label_names, key)} {count}")
+        return lines
+
+
+def render():
+    """所有指标的 Prometheus 文本格式"""
+    return "\n".join(line for metric in _registry for line in metric.render()) + "\n"
+
+
+# === 抓取指标 ===
+_FETCH_LABELS = ("province", "phase", "host")
+
+FETCH_SECONDS = Histogram("crawl_fetch_seconds", "单次 HTTP 请求的耗时（秒），含下载正文", _FETCH_LABELS)
+FETCH_BYTES = Counter("crawl_fetch_bytes_total", "下载的正文字节数", _FETCH_LABELS)
+PAGES = Counter("crawl_pages_total", "请求的页面数，含 304 复用缓存的页面", _FETCH_LABELS)
+RETRIES = Counter("crawl_retries_total", "请求重试次数", _FETCH_LABELS)
+ERRORS = Counter("crawl_errors_total", "失败的页面请求数（异常、熔断或 4xx/5xx 响应）", _FETCH_LABELS)
+PARSE_SECONDS = Histogram("crawl_parse_seconds", "构建 BeautifulSoup 的耗时（秒）", ("province", "phase"), PARSE_BUCKETS)
+ARTICLES = Counter("crawl_articles_total", "抓取到的文章数", ("province",))
+PROVINCE_SECONDS = Histogram("crawl_province_seconds", "单个省份整次抓取的耗时（秒）", ("province",))
+
+# === 接口指标 ===
+HTTP_SECONDS = Histogram(
+    "http_request_seconds", "接口请求耗时（秒），流式接口为返回响应头的时间", ("method", "path", "status"))
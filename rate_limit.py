@@ -0,0 +1,83 @@
+"""
+按主机的令牌桶限速：每个主机按配置的速率补充令牌，允许一定突发；
+同一个桶可以同时被线程（acquire）和 asyncio 任务（acquire_async）使用
+"""
+import asyncio
+import threading
+import time
+
+import config
+
+
+def _parse_rate_limits(value):
+    """解析 "host=rate:burst,host=rate" 形式的配置，rate 为每秒请求数"""
+    limits = {}
+    for item in value.split(","):
+        if "=" not in item:
+            continue
+        host, spec = item.split("=", 1)
+        rate, _, burst = spec.partition(":")
+        limits[host.strip()] = (float(rate), int(burst or 1))
+    return limits
+
+
+# 江苏站点要求慢速访问，默认每秒一个请求
+RATE_LIMITS = _parse_rate_limits(config.get("RATE_LIMITS", "lyj.jiangsu.gov.cn=1:1"))
+
+
+class TokenBucket:
+    """令牌桶：取令牌时先预留，令牌不足则返回需要等待的时间，保证多个等待者按到达顺序放行"""
+
+    def __init__(self, rate, burst=1):
+        self.rate = rate
+        self.capacity = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _reserve(self):
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= 1
+            return 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+
+    def acquire(self):
+        wait = self._reserve()
+        if wait:
+            time.sleep(wait)
+        return wait
+
+    async def acquire_async(self):
+        wait = self._reserve()
+        if wait:
+            await asyncio.sleep(wait)
+        return wait
+
+
+_buckets_lock = threading.Lock()
+_buckets = {}
+
+
+def bucket_for(host):
+    """返回主机的令牌桶；未配置限速的主机返回 None"""
+    if host not in RATE_LIMITS:
+        return None
+    with _buckets_lock:
+        bucket = _buckets.get(host)
+        if bucket is None:
+            bucket = _buckets[host] = TokenBucket(*RATE_LIMITS[host])
+    return bucket
+
+
+def acquire(host):
+    """在线程中等待主机的令牌，返回等待的秒数"""
+    bucket = bucket_for(host)
+    return bucket.acquire() if bucket else 0.0
+
+
+async def acquire_async(host):
+    """在 asyncio 任务中等待主机的令牌，返回等待的秒数"""
+    bucket = bucket_for(host)
+    return await bucket.acquire_async() if bucket else 0.0
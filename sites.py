@@ -0,0 +1,61 @@
+"""
+省份注册表：按返回顺序登记各省的代码、名称与模块名；各省模块在第一次抓取时才导入，
+启动时不必加载 bs4、requests 与全部省份的解析规则
+"""
+import importlib
+import threading
+from collections import namedtuple
+from urllib.parse import urlsplit
+
+Province = namedtuple("Province", "code name module")
+
+PROVINCES = [
+    Province("13", "河北", "_13hebei"),
+    Province("14", "山西", "_14sanxi"),
+    Province("15", "内蒙古", "_15neimenggu"),
+    Province("21", "辽宁", "_21liaoning"),
+    Province("22", "吉林", "_22jilin"),
+    Province("23", "黑龙江", "_23heilongjiang"),
+    Province("32", "江苏", "_32jiangsu"),
+    Province("33", "浙江", "_33zhejiang"),
+    Province("35", "福建", "_35fujian"),
+    Province("41", "河南", "_41henan"),
+    Province("44", "广东", "_44guangdong"),
+    Province("46", "海南", "_46hainan"),
+    Province("50", "重庆", "_50chongqing"),
+    Province("52", "贵州", "_52guizhou"),
+    Province("53", "云南", "_53yunan"),
+    Province("54", "西藏", "_54xizang"),
+    Province("61", "陕西", "_61shanxi"),
+    Province("63", "青海", "_63qinghai"),
+    Province("64", "宁夏", "_64ningxia"),
+    Province("65", "新疆", "_65xinjiang"),
+]
+BY_CODE = {province.code: province for province in PROVINCES}
+
+_lock = threading.Lock()
+_sites = {}
+
+
+def load(code):
+    """返回省份模块声明的 engine.Site，首次调用时导入该模块"""
+    site = _sites.get(code)
+    if site is None:
+        # 逐个导入，避免多个抓取线程同时导入共用的 engine 等模块
+        with _lock:
+            site = _sites.get(code)
+            if site is None:
+                site = _sites[code] = importlib.import_module(BY_CODE[code].module).SITE
+    return site
+
+
+def run(code):
+    """抓取一个省份"""
+    import engine
+    return engine.run(load(code))
+
+
+def hosts(code):
+    """省份起始页所在的主机；模块尚未导入时为空"""
+    site = _sites.get(code)
+    return sorted({urlsplit(url).hostname for url in site.start_urls}) if site else []
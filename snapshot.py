@@ -0,0 +1,238 @@
+"""
+新闻快照：后台定时抓取并保存在内存中，接口直接返回已序列化好的最新结果
+"""
+import asyncio
+import json
+import threading
+import time
+from concurrent.futures import Future
+from datetime import datetime
+from functools import cached_property
+
+import config
+
+REFRESH_INTERVAL = config.get_float("REFRESH_INTERVAL", 1800)  # 后台刷新间隔（秒）
+
+
+class SingleFlight:
+    """同一 key 同时只执行一次：执行期间到达的调用者直接等待并共享这次的结果"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._flights = {}
+        self.calls = 0
+        self.coalesced = 0
+
+    def do(self, key, func):
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = Future()
+                self.calls += 1
+            else:
+                self.coalesced += 1
+        if not leader:
+            return flight.result()
+
+        try:
+            result = func()
+        except BaseException as e:
+            flight.set_exception(e)
+            raise
+        else:
+            flight.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                del self._flights[key]
+
+    def running(self, key):
+        """正在执行的 key 的 Future，没有时返回 None；等待它的调用者同样计入 coalesced"""
+        with self._lock:
+            flight = self._flights.get(key)
+            if flight is not None:
+                self.coalesced += 1
+            return flight
+
+
+class Snapshot:
+    """一次抓取的结果，创建后不再修改；news 保存完整的 Article，body 是按 render 整理后的展示文本，
+    第一次返回时才序列化"""
+
+    def __init__(self, news, status, render, created_at=None):
+        self.news = news
+        self.status = status
+        self.created_at = created_at or time.time()
+        self.status_header = json.dumps(status)
+        self._render = render
+
+    @cached_property
+    def body(self):
+        return json.dumps(self._render(self.news), ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+    def age(self):
+        return time.time() - self.created_at
+
+    def headers(self):
+        return {
+            "X-Crawl-Status": self.status_header,
+            "X-Snapshot-Age": f"{self.age():.1f}",
+            "X-Snapshot-Time": datetime.fromtimestamp(self.created_at).isoformat(timespec="seconds"),
+        }
+
+
+class NewsSnapshot:
+    """保存最近一次抓取的快照；读取时不加锁，刷新时整体替换。
+    crawl_func(codes, on_province) 抓取指定代码的省份，codes 为 None 时抓取全部，每个省份结束时调用 on_province；
+    只请求部分省份时单独抓取的结果按省份保存"""
+
+    def __init__(self, crawl_func, render):
+        self._crawl = crawl_func
+        self._render = render
+        self._flight = SingleFlight()
+        self.current = None
+        self._provinces = {}  # 省份代码 -> 包含该省的最近一次单独抓取
+        self._lock = threading.Lock()
+        self._listeners = []  # 关注进行中的全量抓取的 on_province 回调
+        self._full_done = {}  # 进行中的全量抓取里已结束的省份 -> (Article 列表, 状态)
+
+    def _crawl_once(self):
+        try:
+            news, status = self._crawl(None, self._on_full_province)
+            ok = sum(1 for state in status.values() if state["status"] == "ok")
+            print(f"抓取完成：{len(news)} 条新闻，{ok}/{len(status)} 个省份成功")
+            self.current = Snapshot(news, status, self._render)
+        finally:
+            with self._lock:
+                self._full_done = {}
+        return self.current
+
+    def _on_full_province(self, code, news, status):
+        with self._lock:
+            self._full_done[code] = (news, status)
+            listeners = list(self._listeners)
+        for listener in listeners:
+            listener(code, news, status)
+
+    def refresh(self):
+        """同步抓取一次并替换快照；已有抓取在进行时等待并复用它的结果"""
+        return self._flight.do("all", self._crawl_once)
+
+    def _wait_full(self, start=False, on_province=None):
+        """等待正在进行的全量抓取，start 为真且没有在进行时开始一次；返回是否等到了全量抓取。
+        on_province 收到这次抓取中各省结束时的结果，开始等待前已结束的省份立即补发"""
+        with self._lock:
+            if on_province:
+                self._listeners.append(on_province)
+            done = list(self._full_done.items())
+        try:
+            if on_province:
+                for code, (news, status) in done:
+                    on_province(code, news, status)
+            flight = self._flight.running("all")
+            if flight is not None:
+                flight.result()
+            elif start:
+                self.refresh()
+            else:
+                return False
+            return True
+        finally:
+            if on_province:
+                with self._lock:
+                    self._listeners.remove(on_province)
+
+    def _crawl_provinces(self, codes, on_province=None):
+        snapshot = Snapshot(*self._crawl(codes, on_province), self._render)
+        for code in codes:
+            self._provinces[code] = snapshot
+        return snapshot
+
+    def _latest(self, code):
+        """某省最新的结果：全量快照与单独抓取中较新的一份"""
+        candidates = [s for s in (self.current, self._provinces.get(code)) if s is not None and code in s.status]
+        return max(candidates, key=lambda s: s.created_at, default=None)
+
+    def _lookup(self, codes, max_age):
+        """各省最新的结果，以及没有结果或结果早于 max_age 秒、需要重新抓取的省份"""
+        latest = {code: self._latest(code) for code in codes}
+        stale = [code for code, s in latest.items() if s is None or (max_age is not None and s.age() > max_age)]
+        return latest, stale
+
+    def stats(self):
+        current = self.current
+        return {
+            "crawls": self._flight.calls,
+            "coalesced": self._flight.coalesced,
+            "age": round(current.age(), 1) if current else None,
+            "province_snapshots": len(self._provinces),
+        }
+
+    def get(self, max_age=None):
+        """返回快照；没有快照或快照早于 max_age 秒时先同步刷新"""
+        current = self.current
+        if current is None or (max_age is not None and current.age() > max_age):
+            current = self.refresh()
+        return current
+
+    def get_provinces(self, codes, max_age=None):
+        """返回只含指定省份的快照；这些省份没有结果或结果早于 max_age 秒时只抓取这几个省份，
+        快照时间取各省结果中最早的一份。还没有快照或全量抓取正在进行时先等它结束，
+        之后仍然过期的省份才单独抓取，避免同一省份被同时抓取两次"""
+        latest, stale = self._lookup(codes, max_age)
+        if stale and self._wait_full(start=self.current is None):
+            latest, stale = self._lookup(codes, max_age)
+        if stale:
+            self._flight.do(",".join(stale), lambda: self._crawl_provinces(stale))
+            latest.update((code, self._latest(code)) for code in stale)
+        news = [article for code in codes for article in latest[code].news if article.province == code]
+        status = {code: latest[code].status[code] for code in codes}
+        created_at = min(latest[code].created_at for code in codes)
+        return Snapshot(news, status, self._render, created_at)
+
+    def stream(self, codes, emit, max_age=None):
+        """逐个省份调用 emit(代码, Article 列表, 状态)：已有结果的省份立即给出，
+        其余省份与 get_provinces 一样只抓取这几个，哪个省份先结束先给出。
+        还没有快照、请求了全部省份或全量抓取正在进行时，转发全量抓取各省的结果，不再另起一次抓取"""
+        latest, stale = self._lookup(codes, max_age)
+        for code in codes:
+            if code not in stale:
+                emit(code, [a for a in latest[code].news if a.province == code], latest[code].status[code])
+        if not stale:
+            return
+
+        wanted = set(stale)
+        emitted = set()
+
+        def on_province(code, news, status):
+            if code in wanted and code not in emitted:
+                emitted.add(code)
+                emit(code, news, status)
+
+        current = self.current
+        whole = current is None or wanted >= current.status.keys()  # 全量快照的状态包含全部省份
+        if self._wait_full(start=whole, on_province=on_province):
+            rest = [code for code in stale if code not in emitted]
+            latest, stale = self._lookup(rest, max_age)
+            for code in rest:
+                if code not in stale:
+                    on_province(code, [a for a in latest[code].news if a.province == code], latest[code].status[code])
+            if not stale:
+                return
+
+        self._flight.do(",".join(stale), lambda: self._crawl_provinces(stale, on_province))
+        # 同样的抓取已在进行时只能等它结束，再一并给出
+        for code in stale:
+            if code not in emitted:
+                s = self._latest(code)
+                emit(code, [a for a in s.news if a.province == code], s.status[code])
+
+    async def run_forever(self, interval=REFRESH_INTERVAL):
+        """后台刷新循环，由应用生命周期启动"""
+        while True:
+            try:
+                await asyncio.to_thread(self.refresh)
+            except Exception as e:
+                print(f"⚠️ 后台抓取失败：{e}")
+            await asyncio.sleep(interval)
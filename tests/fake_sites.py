@@ -0,0 +1,93 @@
+"""
+测试用的假站点：替换 transport 会话的连接适配器，按 URL 返回登记好的页面并记录请求，不访问真实网站。
+缓存与水位线写到临时目录；须在导入其他项目模块之前导入本模块
+"""
+import io
+import os
+import tempfile
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+TMP_DIR = tempfile.mkdtemp(prefix="news-crawler-test-")
+os.environ.update(
+    ARTICLE_CACHE="0",
+    ARTICLE_CACHE_PATH=os.path.join(TMP_DIR, "articles.sqlite3"),
+    HTTP_CACHE="0",
+    HTTP_CACHE_PATH=os.path.join(TMP_DIR, "http.sqlite3"),
+    WATERMARK_PATH=os.path.join(TMP_DIR, "watermarks.json"),
+    INCREMENTAL_CRAWL="0",
+    SNIPPET_MODE="0",
+    HTTP_RETRIES="0",
+)
+
+from requests.adapters import BaseAdapter  # noqa: E402
+from requests.models import Response  # noqa: E402
+
+import transport  # noqa: E402
+
+
+class FakeAdapter(BaseAdapter):
+    """pages：URL -> HTML；没有登记的 URL 返回 404"""
+
+    def __init__(self, pages, log):
+        super().__init__()
+        self.pages = pages
+        self.log = log
+        self._lock = threading.Lock()
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        with self._lock:
+            self.log.append(request.url)
+        html = self.pages.get(request.url)
+        body = (html or "").encode("utf-8")
+        resp = Response()
+        resp.status_code = 200 if html is not None else 404
+        resp.headers["Content-Type"] = "text/html; charset=utf-8"
+        resp.headers["Content-Length"] = str(len(body))
+        resp.raw = io.BytesIO(body)
+        resp.url = request.url
+        resp.request = request
+        if not stream:
+            resp._content = body
+        return resp
+
+    def close(self):
+        pass
+
+
+@contextmanager
+def serve(pages):
+    """在此上下文中 transport 的请求都由 pages 应答，返回按顺序记录请求 URL 的列表"""
+    log = []
+    adapters = dict(transport._session.adapters)
+    adapter = FakeAdapter(pages, log)
+    transport._session.mount("http://", adapter)
+    transport._session.mount("https://", adapter)
+    try:
+        yield log
+    finally:
+        transport._session.adapters.clear()
+        transport._session.adapters.update(adapters)
+
+
+# === 页面 ===
+def day(days_ago):
+    """days_ago 天前的日期，格式为 YYYY-MM-DD"""
+    return (datetime.now() - timedelta(days=days_ago)).strftime("%Y-%m-%d")
+
+
+def list_page(items, sidebar=""):
+    """items：[(链接, 标题, 日期)]；sidebar 追加在新闻列表之后"""
+    lis = "".join(f'<li><a href="{href}" title="{title}">{title}</a><span>{date}</span></li>'
+                  for href, title, date in items)
+    return f'<html><body><ul class="list">{lis}</ul>{sidebar}</body></html>'
+
+
+def detail_page(title, paragraphs=8):
+    """正文页：导航与作者信息之后是若干段正文"""
+    body = "".join(f"<p>{title}第{i}段，推进生态保护修复，开展森林防火与草原监测。</p>\n" for i in range(paragraphs))
+    return (f'<html><head><meta name="ArticleTitle" content="{title}"></head><body>'
+            f'<div id="main">\n<p>您当前的位置：首页 > 林草资讯</p>\n'
+            f'<p>作者：张三 发表时间：{day(1)} 点击率：12 字体 大 中 小 视力色</p>\n'
+            f'<script>var a = 1;</script>\n{body}</div></body></html>')
@@ -0,0 +1,199 @@
+"""
+engine 的回归测试：展示格式与抓取结果对照改造前各省模块的写法，站点页面由 fake_sites 提供
+"""
+import re
+import unittest
+from unittest import mock
+
+from bs4 import BeautifulSoup
+
+from tests import fake_sites  # 先设置好临时目录再导入项目模块
+from tests.fake_sites import day, detail_page, list_page
+
+import article_cache
+import config
+import engine
+import sites
+import watermarks
+
+L = config.CONTENT_LENGTH
+
+
+def _flat(text):
+    return text.replace("\n", "").replace("\r", "")
+
+
+# === 改造前的写法 ===
+# 各省模块原先自行截断并加前缀；陕西、宁夏（新疆同宁夏）截断后的正文按统一规则多保留几个字，单独比较
+BASELINE_DISPLAY = {
+    "13": lambda t: "河北省林草信息，" + (t[:L] + "..." if len(t) > L else t),
+    "50": lambda t: t[:L] + "..." if len(t) > L else t,
+    "23": lambda t: "黑龙江省林草信息," + t[:L] + "..." if len(t) > L else t,
+    "35": lambda t: "福建省林草信息，" + _flat(t)[:L] + "..." if len(t) > L else t,
+    "61": lambda t: _flat("陕西省林草信息，" + t[:L] + "...") if len(t) > L else t,
+    "64": lambda t: (lambda f: f[:L] + "..." if len(f) > L else f)(_flat("宁夏回族自治区，" + t)),
+}
+LONGER_WHEN_TRUNCATED = {"61", "64"}
+
+TEXTS = [
+    "",
+    "短讯",
+    "标题\n2024-10-15\n正文",
+    "字" * L,
+    "字" * (L + 1),
+    "第一段\n" * 100,
+    "行\n" * (L // 2 + 10),
+]
+
+
+def _baseline_detail(html, strip_tags, cleaning):
+    """改造前河北、黑龙江的详情页解析：取第一个足够长的 div，去掉杂项与导航段落后按 cleaning 清洗"""
+    soup = BeautifulSoup(html, "html.parser")
+    content_div = None
+    for div in soup.find_all("div"):
+        text = div.get_text().strip()
+        if len(text) > 200 and len(text.split("\n")) > 3:
+            content_div = div
+            break
+    for element in content_div.find_all(["nav", "header", "footer", "aside", "script", "style", *strip_tags]):
+        element.decompose()
+    for p in content_div.find_all("p"):
+        if any(keyword in p.get_text() for keyword in ["您当前的位置", "首页 >", "林草资讯"]):
+            p.decompose()
+    return cleaning(content_div.get_text(separator="\n", strip=True))
+
+
+def _baseline_hebei(html):
+    def cleaning(text):
+        text = re.sub(r"\n\s*\n", "", text)
+        text = re.sub(r"\s+", " ", text).strip()
+        text = re.sub(r"林草资讯", "", text)
+        text = re.sub(r"作者.*?(?=发表时间)", "", text, flags=re.DOTALL)
+        return re.sub(r"点击率.*?视力色", "", text, flags=re.DOTALL)
+    return _baseline_detail(html, [], cleaning)
+
+
+def _baseline_heilongjiang(html):
+    def cleaning(text):
+        text = re.sub(r"\n\s*\n", "\n\n", text)
+        return re.sub(r"\s+", " ", text).strip()
+    strip_tags = ["a", "table", "img", "figure", "form", "button", "input", "select", "textarea"]
+    return _baseline_detail(html, strip_tags, cleaning)
+
+
+# === 假站点 ===
+HEBEI_LIST = "http://lycy.hebei.gov.cn/list_news_group_13.html?keyword=&sortid=0&sortkey=&page={n}"
+HEBEI_DETAIL = "http://lycy.hebei.gov.cn/content/{n}.html"
+
+
+def _hebei_pages(pages):
+    """pages：每页的 [(编号, 几天前)]；详情页按编号登记"""
+    site = {}
+    for n, items in enumerate(pages, 1):
+        site[HEBEI_LIST.format(n=n)] = list_page(
+            [(f"/content/{i}.html", f"河北{i}", day(days)) for i, days in items],
+            # 侧栏里的旧日期不影响翻页
+            sidebar=f'<ul class="side"><li><a href="/content/old.html">旧闻</a> {day(400)}</li></ul>',
+        )
+        for i, _days in items:
+            site[HEBEI_DETAIL.format(n=i)] = detail_page(f"河北{i}")
+    return site
+
+
+def _run(code_or_site, pages):
+    site = sites.load(code_or_site) if isinstance(code_or_site, str) else code_or_site
+    with fake_sites.serve(pages) as log:
+        articles = engine.run(site)
+    return articles, log
+
+
+class DisplayTest(unittest.TestCase):
+    def test_matches_baseline(self):
+        for code, baseline in BASELINE_DISPLAY.items():
+            site = sites.load(code)
+            for text in TEXTS:
+                with self.subTest(code=code, text=text[:10]):
+                    result = engine.display(site, engine.Article(code, "u", "t", "d", text))
+                    expected = baseline(text)
+                    if code in LONGER_WHEN_TRUNCATED and expected.endswith("..."):
+                        # 前缀不再计入长度：保留的正文不少于原先，刚好 L 字的正文不再截断
+                        self.assertTrue(result.startswith(expected[:-3]), result)
+                    else:
+                        self.assertEqual(result, expected)
+
+    def test_every_site_uses_a_covered_variant(self):
+        variants = {sites.load(code).display[1:] for code in BASELINE_DISPLAY}
+        for province in sites.PROVINCES:
+            with self.subTest(code=province.code):
+                self.assertIn(sites.load(province.code).display[1:], variants)
+
+
+class RunTest(unittest.TestCase):
+    def test_paginated_site(self):
+        pages = _hebei_pages([[(1, 0), (2, 1), (3, 2)], [(4, 3), (5, 10)], [(6, 20)]])
+        articles, log = _run("13", pages)
+
+        self.assertEqual([a.url for a in articles], [HEBEI_DETAIL.format(n=i) for i in range(1, 5)])
+        self.assertEqual([a.title for a in articles], [f"河北{i}" for i in range(1, 5)])
+        self.assertEqual([a.date for a in articles], [day(d) for d in range(4)])
+        for article in articles:
+            self.assertEqual(article.text, _baseline_hebei(pages[article.url]))
+        self.assertEqual([url for url in log if "list_news" in url], [HEBEI_LIST.format(n=n) for n in (1, 2, 3)])
+
+    def test_first_page_only_site(self):
+        lists = [
+            "http://lyhcyj.hlj.gov.cn/lyhcyj/c107199/common_list.shtml",
+            "http://lyhcyj.hlj.gov.cn/lyhcyj/c107201/common_list.shtml",
+        ]
+        pages = {}
+        expected = []
+        for column, start_url in enumerate(lists):
+            items = []
+            for i, days in enumerate((0, 2, 30)):
+                month = day(days)[:7].replace("-", "")
+                href = f"/lyhcyj/c10720{column}/{month}/c00_{column}{i}.shtml"
+                items.append((href, f"黑龙江{column}{i}", day(days)))
+                pages[f"http://lyhcyj.hlj.gov.cn{href}"] = detail_page(f"黑龙江{column}{i}")
+                if days < 30:
+                    expected.append(f"http://lyhcyj.hlj.gov.cn{href}")
+            pages[start_url] = list_page(items)
+
+        articles, log = _run("23", pages)
+
+        self.assertEqual([a.url for a in articles], expected)
+        for article in articles:
+            self.assertEqual(article.text, _baseline_heilongjiang(pages[article.url]))
+        self.assertEqual(sorted(log), sorted(lists + expected))
+
+    def test_paginated_parser_taking_item(self):
+        def parse(news):
+            return f"{news['title']} {news['date']:%Y-%m-%d}"
+        site = sites.load("13")._replace(detail=parse, detail_takes_item=True)
+        articles, _log = _run(site, _hebei_pages([[(1, 0), (2, 1)], [(3, 20)]]))
+        self.assertEqual([a.text for a in articles], [f"河北1 {day(0)}", f"河北2 {day(1)}"])
+
+    def test_article_cache(self):
+        pages = _hebei_pages([[(1, 0), (2, 1)], [(3, 20)]])
+        cache = article_cache.ArticleCache(f"{fake_sites.TMP_DIR}/articles-run.sqlite3")
+        with mock.patch.object(article_cache, "ENABLED", True), mock.patch.object(article_cache, "cache", cache):
+            first, _log = _run("13", pages)
+            second, log = _run("13", pages)
+        self.assertEqual(first, second)
+        self.assertEqual([url for url in log if "content" in url], [])
+
+    def test_incremental_keeps_items_after_pinned_one(self):
+        old = [[("pin", 3), (1, 0), (2, 1)], [(3, 2), (4, 3)], [(5, 4), (6, 20)], [(7, 30)]]
+        new = [[("pin", 3), (0, 0), (1, 0)], [(2, 1), (3, 2)], [(4, 3), (5, 4)], [(6, 20)]]
+        full, _log = _run("13", _hebei_pages(new))
+
+        store = watermarks.WatermarkStore(f"{fake_sites.TMP_DIR}/watermarks-pinned.json")
+        with mock.patch.object(watermarks, "INCREMENTAL", True), mock.patch.object(watermarks, "store", store):
+            _run("13", _hebei_pages(old))
+            incremental, log = _run("13", _hebei_pages(new))
+
+        self.assertEqual(incremental, full)
+        self.assertLess(len([url for url in log if "list_news" in url]), 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,103 @@
+"""
+NewsSnapshot 的合并抓取：全量抓取进行中时，按省份查询与流式返回都等它的结果，不再重复抓取同一省份
+"""
+import threading
+import unittest
+
+from tests import fake_sites  # noqa: F401  先设置好临时目录再导入项目模块
+
+from engine import Article
+from snapshot import NewsSnapshot
+
+CODES = ["13", "14", "15"]
+
+
+class FakeCrawl:
+    """crawl_func(codes, on_province)：记录每次抓取的省份；第一个省份结束后，等 release 放行才抓其余省份"""
+
+    def __init__(self):
+        self.calls = []
+        self.first_done = threading.Event()
+        self.release = threading.Event()
+        self.release.set()
+
+    def __call__(self, codes, on_province):
+        self.calls.append(codes)
+        news, status = [], {}
+        for i, code in enumerate(codes or CODES):
+            if i == 1:
+                self.first_done.set()
+                self.release.wait(5)
+            articles = [Article(code, f"http://{code}/1.html", f"{code}标题", "2024-10-15", f"{code}正文")]
+            state = {"status": "ok", "count": 1, "elapsed": 0}
+            news += articles
+            status[code] = state
+            if on_province:
+                on_province(code, articles, state)
+        return news, status
+
+
+def _render(news):
+    return [article.text for article in news]
+
+
+def _in_thread(func, *args):
+    result = {}
+    thread = threading.Thread(target=lambda: result.setdefault("value", func(*args)))
+    thread.start()
+    return thread, result
+
+
+class CoalesceTest(unittest.TestCase):
+    def setUp(self):
+        self.crawl = FakeCrawl()
+        self.snapshot = NewsSnapshot(self.crawl, _render)
+
+    def _start_full_crawl(self):
+        """开始一次全量抓取，并停在第一个省份结束之后"""
+        self.crawl.release.clear()
+        refresh, _ = _in_thread(self.snapshot.refresh)
+        self.assertTrue(self.crawl.first_done.wait(5))
+        return refresh
+
+    def test_province_request_waits_for_full_crawl(self):
+        refresh = self._start_full_crawl()
+        request, result = _in_thread(self.snapshot.get_provinces, ["14"])
+        self.crawl.release.set()
+        refresh.join(5)
+        request.join(5)
+
+        self.assertEqual(self.crawl.calls, [None])
+        self.assertEqual(_render(result["value"].news), ["14正文"])
+
+    def test_province_request_at_cold_start_runs_full_crawl(self):
+        self.snapshot.get_provinces(["14"])
+        self.assertEqual(self.crawl.calls, [None])
+        self.assertIsNotNone(self.snapshot.current)
+
+    def test_stale_province_is_crawled_alone(self):
+        self.snapshot.refresh()
+        self.snapshot.get_provinces(["15"], max_age=0)
+        self.assertEqual(self.crawl.calls, [None, ["15"]])
+
+    def test_stream_relays_full_crawl(self):
+        refresh = self._start_full_crawl()
+        events = []
+        stream, _ = _in_thread(self.snapshot.stream, CODES, lambda code, news, status: events.append(code))
+        self.crawl.release.set()
+        refresh.join(5)
+        stream.join(5)
+
+        self.assertEqual(self.crawl.calls, [None])
+        self.assertEqual(sorted(events), CODES)
+
+    def test_stream_of_every_province_updates_snapshot(self):
+        events = []
+        self.snapshot.stream(CODES, lambda code, news, status: events.append(code))
+        self.assertEqual(self.crawl.calls, [None])
+        self.assertEqual(events, CODES)
+        self.assertEqual(_render(self.snapshot.current.news), ["13正文", "14正文", "15正文"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,151 @@
+"""
+正文清洗：各省把清洗规则声明为数据，模块加载时编译成 Cleaner，按声明顺序执行。
+多余的空白规则省去；"起始词…结束词" 的片段删除用 str.find 线性查找，
+与 re.sub(r'起始词.*?结束词', ...) 结果一致，但不会因为只有起始词没有结束词而反复回溯。
+track_open_spans() 记录清洗时找不到结束词的起始词位置，供截断模式判断是否还要继续读取
+"""
+import contextvars
+import re
+from collections import namedtuple
+from contextlib import contextmanager
+
+Rule = namedtuple("Rule", "kind args")
+
+_WHITESPACE = re.compile(r"\s+")
+_BLANK_LINES = re.compile(r"\n\s*\n")
+_open_spans = contextvars.ContextVar("open_spans", default=None)
+
+
+# === 规则声明 ===
+def blank_lines(repl):
+    """等价于 re.sub(r'\\n\\s*\\n', repl, text)"""
+    return Rule("blank_lines", (repl,))
+
+
+def whitespace(repl=" ", strip=False):
+    """等价于 re.sub(r'\\s+', repl, text)，strip 为真时再 .strip()"""
+    return Rule("whitespace", (repl, strip))
+
+
+def literal(old, new=""):
+    """等价于 text.replace(old, new)"""
+    return Rule("literal", (old, new))
+
+
+def span(start, end, repl="", keep_end=False, dotall=True):
+    """删除从 start 到最近的 end 之间的片段（含两端），替换为 repl；
+    keep_end 为真时保留 end 本身，等价于 re.sub(r'start.*?(?=end)', repl, text)；
+    dotall 为假时片段不能跨行，等价于不带 re.DOTALL 的写法"""
+    return Rule("span", (start, end, repl, keep_end, dotall))
+
+
+# === 执行 ===
+@contextmanager
+def track_open_spans():
+    """记录此上下文中清洗时找不到结束词的起始词在清洗结果中的位置；
+    正文只读了一部分时，结束词可能还在没读到的内容里"""
+    positions = []
+    token = _open_spans.set(positions)
+    try:
+        yield positions
+    finally:
+        _open_spans.reset(token)
+
+
+def _remove_spans(text, start, end, repl, keep_end, dotall):
+    """返回 (删除片段后的文本, 找不到结束词的起始词在其中的位置，没有时为 None)"""
+    parts = []
+    pos = 0
+    search_from = 0
+    open_at = None
+    while True:
+        i = text.find(start, search_from)
+        if i == -1:
+            break
+        j = text.find(end, i + len(start))
+        if j == -1:
+            # 之后的起始词也都找不到结束词
+            open_at = sum(map(len, parts)) + i - pos
+            break
+        if not dotall:
+            newline = text.find("\n", i + len(start), j)
+            if newline != -1:
+                search_from = i + 1
+                continue
+        parts.append(text[pos:i])
+        parts.append(repl)
+        pos = search_from = j if keep_end else j + len(end)
+    if not parts:
+        return text, open_at
+    parts.append(text[pos:])
+    return "".join(parts), open_at
+
+
+def _blank_lines_pass(repl):
+    return lambda text: _BLANK_LINES.sub(repl, text)
+
+
+def _whitespace_pass(blank_repl, repl, strip):
+    """空白规则；前面紧跟的空行规则替换结果仍是空白，或两者都把空白删掉时，
+    它不影响结果，直接省去这一遍"""
+    redundant = blank_repl is None or blank_repl.isspace() or (blank_repl == "" and repl == "")
+
+    def run(text):
+        if not redundant:
+            text = _BLANK_LINES.sub(blank_repl, text)
+        text = _WHITESPACE.sub(repl, text)
+        return text.strip() if strip else text
+    return run
+
+
+def _compile(rules):
+    """编译为 [(是否为片段删除, 函数)]；片段删除的函数返回 _remove_spans 的结果"""
+    steps = []
+    pending_blank = None
+    for rule in rules:
+        if rule.kind == "blank_lines":
+            if pending_blank is not None:
+                steps.append((False, _blank_lines_pass(pending_blank)))
+            pending_blank = rule.args[0]
+            continue
+        if rule.kind == "whitespace":
+            steps.append((False, _whitespace_pass(pending_blank, *rule.args)))
+            pending_blank = None
+            continue
+        if pending_blank is not None:
+            steps.append((False, _blank_lines_pass(pending_blank)))
+            pending_blank = None
+        if rule.kind == "literal":
+            old, new = rule.args
+            steps.append((False, lambda text, old=old, new=new: text.replace(old, new)))
+        elif rule.kind == "span":
+            steps.append((True, lambda text, args=rule.args: _remove_spans(text, *args)))
+        else:
+            raise ValueError(f"未知的清洗规则：{rule.kind}")
+    if pending_blank is not None:
+        steps.append((False, _blank_lines_pass(pending_blank)))
+    return steps
+
+
+class Cleaner:
+    """编译好的清洗流程"""
+
+    def __init__(self, rules):
+        self.rules = list(rules)
+        self._steps = _compile(self.rules)
+
+    def __call__(self, text):
+        return self._run(text, 0)
+
+    def _run(self, text, first):
+        positions = _open_spans.get()
+        for index in range(first, len(self._steps)):
+            is_span, step = self._steps[index]
+            if not is_span:
+                text = step(text)
+                continue
+            text, open_at = step(text)
+            if open_at is not None and positions is not None:
+                # 起始词之前的部分经过其余步骤后的长度，即起始词在清洗结果中的位置
+                positions.append(len(self._run(text[:open_at], index + 1)))
+        return text
@@ -0,0 +1,350 @@
+"""
+共享 HTTP 传输层：所有省份爬虫共用一个带连接池的 Session，按主机保持长连接，
+并统计每个主机的请求数与实际建立的连接数（连接复用率）；
+失败的请求单独按指数退避重试，一次抓取内的重试总数受预算限制
+"""
+import contextvars
+import random
+import threading
+import time
+from contextlib import contextmanager
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+import charset_resolver
+import circuit_breaker
+import config
+import http_cache
+import metrics
+import rate_limit
+
+POOL_CONNECTIONS = config.get_int("HTTP_POOL_CONNECTIONS", 32)  # 缓存的主机连接池个数
+POOL_MAXSIZE = config.get_int("HTTP_POOL_MAXSIZE", 8)           # 每个主机保持的长连接数
+TIMEOUT = config.get_float("HTTP_TIMEOUT", 10)
+RETRIES = config.get_int("HTTP_RETRIES", 2)                      # 单个请求失败后的最多重试次数
+RETRY_BACKOFF = config.get_float("HTTP_RETRY_BACKOFF", 0.5)      # 首次重试的退避上限（秒），之后逐次翻倍
+RETRY_BACKOFF_MAX = config.get_float("HTTP_RETRY_BACKOFF_MAX", 8)
+CRAWL_RETRY_BUDGET = config.get_int("CRAWL_RETRY_BUDGET", 60)   # 一次抓取内所有请求共享的重试次数
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+CHROME_UA = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+DEFAULT_UA = 'Mozilla/5.0'
+
+
+# === 连接复用统计 ===
+_stats_lock = threading.Lock()
+_host_stats = {}
+
+
+def _count(host, key):
+    with _stats_lock:
+        stats = _host_stats.setdefault(host, {"requests": 0, "connections": 0, "retries": 0})
+        stats[key] += 1
+
+
+def transport_stats():
+    """返回每个主机的请求数、重试数、建立的连接数与连接复用率"""
+    with _stats_lock:
+        snapshot = {host: dict(stats) for host, stats in _host_stats.items()}
+    for stats in snapshot.values():
+        reused = max(stats["requests"] - stats["connections"], 0)
+        stats["reused"] = reused
+        stats["reuse_rate"] = round(reused / stats["requests"], 3) if stats["requests"] else 0.0
+    return snapshot
+
+
+class _CountingHTTPConnection(HTTPConnection):
+    def connect(self):
+        _count(self.host, "connections")
+        return super().connect()
+
+
+class _CountingHTTPSConnection(HTTPSConnection):
+    def connect(self):
+        _count(self.host, "connections")
+        return super().connect()
+
+
+class _CountingHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _CountingHTTPConnection
+
+
+class _CountingHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _CountingHTTPSConnection
+
+
+class _PooledAdapter(HTTPAdapter):
+    """每个主机一个长连接池，建立连接时计数"""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _CountingHTTPConnectionPool,
+            "https": _CountingHTTPSConnectionPool,
+        }
+
+
+def _build_session():
+    session = requests.Session()
+    adapter = _PooledAdapter(pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+_session = _build_session()
+
+
+# === 重试预算 ===
+class RetryBudget:
+    """一次抓取内所有请求共享的重试次数，跨线程安全"""
+
+    def __init__(self, limit):
+        self.limit = limit
+        self.used = 0
+        self._lock = threading.Lock()
+
+    def take(self):
+        with self._lock:
+            if self.used >= self.limit:
+                return False
+            self.used += 1
+            return True
+
+
+_retry_budget = contextvars.ContextVar("retry_budget", default=None)
+
+
+@contextmanager
+def retry_budget(limit=CRAWL_RETRY_BUDGET):
+    """在此上下文（及复制了该上下文的线程）中发出的请求共享一份重试预算"""
+    budget = RetryBudget(limit)
+    token = _retry_budget.set(budget)
+    try:
+        yield budget
+    finally:
+        _retry_budget.reset(token)
+
+
+# === 响应记录 ===
+_response_log = contextvars.ContextVar("response_log", default=None)
+
+
+@contextmanager
+def track_responses():
+    """记录此上下文中每个请求最终返回的状态码，供调用方判断结果是否可缓存"""
+    statuses = []
+    token = _response_log.set(statuses)
+    try:
+        yield statuses
+    finally:
+        _response_log.reset(token)
+
+
+def _record_status(resp):
+    statuses = _response_log.get()
+    if statuses is not None:
+        statuses.append(resp.status_code)
+
+
+def _backoff(attempt):
+    """指数退避加全抖动"""
+    return random.uniform(0, min(RETRY_BACKOFF_MAX, RETRY_BACKOFF * 2 ** attempt))
+
+
+def _may_retry(attempt):
+    if attempt >= RETRIES:
+        return False
+    budget = _retry_budget.get()
+    return budget is None or budget.take()
+
+
+# === 请求 ===
+def _header_encoding(resp):
+    content_type = resp.headers.get('Content-Type', '').lower()
+    if 'charset=gbk' in content_type or 'charset=gb2312' in content_type:
+        return 'gbk'
+    return 'utf-8'
+
+
+def _apply_charset(resp, charset):
+    """按各站点原有规则设置响应编码：header 只看 Content-Type，apparent 由 charset_resolver.resolve 逐级判断"""
+    if charset == "header":
+        resp.encoding = _header_encoding(resp)
+    else:
+        resp.encoding = charset_resolver.resolve(resp)
+
+
+def get(url, user_agent=DEFAULT_UA, timeout=TIMEOUT, headers=None, stream=False):
+    """通过共享连接池发送 GET 请求；按主机限速，连接错误、超时与 429/5xx 响应单独退避重试，
+    主机熔断时直接抛出 CircuitOpenError；stream 为真时只读取响应头，由调用方按需读取正文。
+    页面数、字节数与失败的请求计入 metrics"""
+    host = urlsplit(url).hostname or ""
+    labels = metrics.labels(host=host)
+    metrics.PAGES.inc(**labels)
+    try:
+        resp = _get_with_retries(url, host, {'User-Agent': user_agent, **(headers or {})}, timeout, stream, labels)
+    except Exception:
+        metrics.ERRORS.inc(**labels)
+        raise
+    if resp.status_code >= 400:
+        metrics.ERRORS.inc(**labels)
+    if not stream:
+        metrics.FETCH_BYTES.inc(len(resp.content), **labels)
+    return resp
+
+
+def _get_with_retries(url, host, headers, timeout, stream, labels):
+    breaker = circuit_breaker.breaker_for(host)
+    attempt = 0
+    while True:
+        breaker.before_request()
+        rate_limit.acquire(host)
+        _count(host, "requests")
+        started = time.perf_counter()
+        try:
+            resp = _session.get(url, headers=headers, timeout=timeout, stream=stream)
+        except (requests.ConnectionError, requests.Timeout):
+            breaker.record_failure()
+            if not _may_retry(attempt):
+                raise
+        except Exception:
+            breaker.record_failure()
+            raise
+        else:
+            if resp.status_code not in RETRY_STATUS:
+                breaker.record_success()
+                _record_status(resp)
+                return resp
+            breaker.record_failure()
+            if not _may_retry(attempt):
+                _record_status(resp)
+                return resp
+            resp.close()
+        finally:
+            metrics.FETCH_SECONDS.observe(time.perf_counter() - started, **labels)
+        _count(host, "retries")
+        metrics.RETRIES.inc(**labels)
+        time.sleep(_backoff(attempt))
+        attempt += 1
+
+
+def get_text(url, user_agent=DEFAULT_UA, charset="apparent", raise_for_status=False, conditional=False):
+    """请求页面并按站点规则解码，返回文本；conditional 为真时发条件请求，304 时返回缓存的正文；
+    处于 snippet_stream(url) 中时只返回目前已读到的开头部分"""
+    stream = _snippet_stream.get()
+    if stream is not None and stream.url == url:
+        return stream.text(user_agent, charset, raise_for_status)
+    conditional = conditional and http_cache.ENABLED
+    cached = http_cache.cache.get(url) if conditional else None
+    resp = get(url, user_agent=user_agent, headers=http_cache.validators(cached) if cached else None)
+    if cached and resp.status_code == 304:
+        http_cache.cache.not_modified(url, cached)
+        return cached.text
+    if raise_for_status:
+        resp.raise_for_status()
+    _apply_charset(resp, charset)
+    if conditional and resp.status_code == 200:
+        http_cache.cache.put(url, resp, resp.text)
+    return resp.text
+
+
+# === 截断读取 ===
+SNIPPET_FIRST_BYTES = config.get_int("SNIPPET_FIRST_BYTES", 16384)  # 截断读取时首次读取的字节数，之后逐次翻倍
+_CHUNK_SIZE = 8192
+
+_snippet_stats = {"pages": 0, "early_exits": 0, "bytes_read": 0, "bytes_skipped": 0}
+
+
+class SnippetStream:
+    """按需读取一个响应的开头部分：每次解析只看已读到的字节，不够时再多读一倍"""
+
+    def __init__(self, url, first_bytes=SNIPPET_FIRST_BYTES):
+        self.url = url
+        self.limit = first_bytes
+        self.buffer = bytearray()
+        self.complete = False
+        self.failed = False
+        self.encoding = None
+        self._resp = None
+        self._chunks = None
+
+    @property
+    def done(self):
+        """已读完整个响应或请求失败，之后的解析结果不会再变"""
+        return self.complete or self.failed
+
+    def _open(self, user_agent, raise_for_status):
+        try:
+            self._resp = get(self.url, user_agent=user_agent, stream=True)
+            if raise_for_status:
+                self._resp.raise_for_status()
+        except Exception:
+            self.failed = True
+            raise
+        self._chunks = self._resp.iter_content(_CHUNK_SIZE)
+
+    def _fill(self):
+        while not self.complete and len(self.buffer) < self.limit:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                self.complete = True
+            else:
+                self.buffer += chunk
+
+    def text(self, user_agent, charset, raise_for_status):
+        if self._resp is None:
+            self._open(user_agent, raise_for_status)
+        self._fill()
+        if self.encoding is None:
+            if charset == "header":
+                self.encoding = _header_encoding(self._resp)
+            else:
+                self.encoding = charset_resolver.resolve_bytes(
+                    bytes(self.buffer), self._resp.headers.get("Content-Type"), self.url, partial=not self.complete)
+        return bytes(self.buffer).decode(self.encoding, errors="replace")
+
+    def grow(self):
+        self.limit *= 2
+
+    def close(self):
+        """结束读取；未读完时直接关闭连接，剩余内容不再下载"""
+        if self._resp is None:
+            return
+        early = not self.complete
+        bytes_read = self._resp.raw.tell()  # 实际从连接读取的字节数（压缩时为压缩后的大小）
+        self._resp.close()
+        metrics.FETCH_BYTES.inc(bytes_read, **metrics.labels(host=urlsplit(self.url).hostname or ""))
+        with _stats_lock:
+            _snippet_stats["pages"] += 1
+            _snippet_stats["bytes_read"] += bytes_read
+            if early:
+                _snippet_stats["early_exits"] += 1
+                length = self._resp.headers.get("Content-Length")
+                if length and length.isdigit():
+                    _snippet_stats["bytes_skipped"] += max(int(length) - bytes_read, 0)
+
+
+_snippet_stream = contextvars.ContextVar("snippet_stream", default=None)
+
+
+@contextmanager
+def snippet_stream(url, first_bytes=SNIPPET_FIRST_BYTES):
+    """在此上下文中对 url 的 get_text 只返回已读到的开头部分，调用方可 grow() 后重新解析"""
+    stream = SnippetStream(url, first_bytes)
+    token = _snippet_stream.set(stream)
+    try:
+        yield stream
+    finally:
+        _snippet_stream.reset(token)
+        stream.close()
+
+
+def snippet_stats():
+    """返回截断读取的页面数、提前结束的次数、读取与跳过（已知长度时）的字节数"""
+    with _stats_lock:
+        return dict(_snippet_stats)
@@ -0,0 +1,88 @@
+"""
+增量抓取水位线：按栏目（第一页列表的 URL）记录最新一条新闻的 URL 与日期，
+以及上次抓到的时间范围内的全部条目；增量模式下翻页连续遇到已见过的新闻即停止，
+其余条目直接沿用上次的记录
+"""
+import json
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+
+import config
+
+INCREMENTAL = config.get("INCREMENTAL_CRAWL", "0") == "1"
+WATERMARK_PATH = config.get("WATERMARK_PATH", "cache/watermarks.json")
+DAYS_AGO = config.DAYS_AGO
+
+
+def _date_str(value):
+    return str(value)[:10] if value else None
+
+
+class WatermarkStore:
+    def __init__(self, path=WATERMARK_PATH):
+        self.path = path
+        self.early_stops = 0
+        self._lock = threading.Lock()
+        self._marks = None
+
+    def _load(self):
+        if self._marks is None:
+            try:
+                with open(self.path, encoding="utf-8") as f:
+                    self._marks = json.load(f)
+            except (OSError, ValueError):
+                self._marks = {}
+        return self._marks
+
+    def _save(self):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self._marks, f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+
+    def known_items(self, column):
+        """返回栏目上次记录的、仍在 DAYS_AGO 范围内的条目，按 url 索引并保持原顺序"""
+        with self._lock:
+            mark = self._load().get(column)
+        # 旧格式的记录没有标题，沿用会丢失标题，当作没有记录重新完整抓取一次
+        if not mark or any("title" not in item for item in mark["items"]):
+            return {}
+        days_ago_date = datetime.now() - timedelta(days=DAYS_AGO)
+        known = {}
+        for item in mark["items"]:
+            if item["date"] and datetime.strptime(item["date"], "%Y-%m-%d") >= days_ago_date:
+                known[item["url"]] = item
+        return known
+
+    def update(self, column, news_list):
+        """用本次抓到的条目替换栏目的水位线"""
+        # 标题一并保存：增量模式下沿用的条目不再请求列表页，Article 的标题只能从这里取
+        items = [
+            {"url": news["url"], "date": _date_str(news.get("date")), "title": news.get("title") or ""}
+            for news in news_list
+        ]
+        with self._lock:
+            marks = self._load()
+            marks[column] = {
+                "newest_url": items[0]["url"] if items else None,
+                "newest_date": items[0]["date"] if items else None,
+                "items": items,
+                "updated_at": time.time(),
+            }
+            self._save()
+
+    def record_early_stop(self):
+        with self._lock:
+            self.early_stops += 1
+
+    def stats(self):
+        with self._lock:
+            return {"incremental": INCREMENTAL, "columns": len(self._load()), "early_stops": self.early_stops}
+
+
+store = WatermarkStore()